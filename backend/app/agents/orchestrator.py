@@ -1,8 +1,11 @@
 """Pentest Orchestrator with HITL/Auto mode support."""
 
+__all__ = ["PentestOrchestrator", "orchestrator"]
+
 from typing import Dict, Any, Optional, Tuple
 from app.core.ollama import ollama_client
-from app.target.parser import TargetParser, ParsedTarget
+from app.core.llm_cache import cached_chat, cached_generate
+from app.target.parser import TargetParser, ParsedTarget, TargetType
 from app.target.validator import TargetValidator
 from app.schemas.session import (
     AgentMode, 
@@ -11,12 +14,14 @@ from app.schemas.session import (
     RiskLevel,
     ActionConfirmation
 )
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache
 import os
-import re
 import uuid
-import json
 import asyncio
+import functools
+import tempfile
+import orjson
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
 from app.tools.executor import get_executor
@@ -24,6 +29,66 @@ from app.core.terminal import terminal_manager
 from app.memory.manager import memory_manager
 
 
+# Risk strings that always force confirmation, regardless of mode
+_CONFIRM_RISKS = frozenset((RiskLevel.HIGH.value, RiskLevel.CRITICAL.value))
+
+# Category-token → pipeline phase, scanned in order (first hit wins)
+_PHASE_TOKENS = (
+    ("recon", "Reconnaissance"),
+    ("subdomain", "Reconnaissance"),
+    ("discover", "Reconnaissance"),
+    ("scan", "Scanning"),
+    ("port", "Scanning"),
+    ("vuln", "Exploitation"),
+    ("exploit", "Exploitation"),
+    ("attack", "Exploitation"),
+    ("report", "Reporting"),
+)
+
+
+def _classify_phase(category: str) -> str:
+    """Map a task category to its pipeline phase (default: Scanning)."""
+    return next((phase for token, phase in _PHASE_TOKENS if token in category), "Scanning")
+
+
+def _extract_json(content: str) -> dict:
+    """Parse LLM output as JSON, tolerating surrounding text.
+
+    Fast path: the router is called with format=\"json\", so orjson usually
+    parses the content directly. Fallback: a linear depth-counting scan for
+    the outermost {...} span instead of a backtracking regex.
+    """
+    try:
+        return orjson.loads(content)
+    except orjson.JSONDecodeError:
+        pass
+
+    start = content.find("{")
+    if start == -1:
+        raise ValueError("No JSON object found in LLM output")
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(content)):
+        ch = content[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return orjson.loads(content[start:i + 1])
+    raise ValueError("Unbalanced JSON object in LLM output")
+
+
 class PentestOrchestrator:
     """
     Orchestrator with two modes:
@@ -34,8 +99,18 @@ class PentestOrchestrator:
     def __init__(self):
         self.history = []
         template_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "prompts")
-        self.jinja_env = Environment(loader=FileSystemLoader(template_dir))
-        
+        bytecode_dir = os.path.join(tempfile.gettempdir(), "jinja_cache")
+        os.makedirs(bytecode_dir, exist_ok=True)
+        self.jinja_env = Environment(
+            loader=FileSystemLoader(template_dir),
+            bytecode_cache=FileSystemBytecodeCache(bytecode_dir),
+            auto_reload=False,
+            cache_size=-1
+        )
+        # Templates are static — load once instead of stat+parse per request
+        self._orchestrator_tmpl = self.jinja_env.get_template("orchestrator.jinja2")
+        self._analysis_tmpl = self.jinja_env.get_template("analysis.jinja2")
+
         # Load environment variables for tools
         load_dotenv()
         
@@ -45,6 +120,40 @@ class PentestOrchestrator:
         
         # Session management (in-memory for now)
         self.sessions: Dict[str, SessionState] = {}
+        # Per-session locks: FastAPI serves requests concurrently, so session
+        # mutations (target, phase, pending action) must be serialized.
+        self._session_locks: Dict[str, asyncio.Lock] = {}
+        # In-flight background target inserts, keyed by session_id
+        self._target_tasks: Dict[str, asyncio.Task] = {}
+
+        # Dedicated pool for blocking tool subprocesses — keeps long scans from
+        # starving the shared default executor used elsewhere in the process
+        self._tool_pool = ThreadPoolExecutor(
+            max_workers=int(os.getenv("TOOL_WORKERS", "16")),
+            thread_name_prefix="tool"
+        )
+
+    async def _resolve_target_id(self, session: SessionState, fallback: Optional[str] = None) -> Optional[str]:
+        """Resolve the stored target ID, awaiting the background insert if needed.
+
+        Falls back to the raw target string when the insert failed or never ran.
+        """
+        if not session.current_target_id:
+            task = self._target_tasks.pop(session.session_id, None)
+            if task is not None:
+                try:
+                    target_obj = await task
+                    session.current_target_id = target_obj.id
+                except Exception as e:
+                    print(f"⚠️ Failed to store target in DB: {e}")
+        return session.current_target_id or fallback or session.current_target
+
+    def _get_session_lock(self, session_id: str) -> asyncio.Lock:
+        """Get (or lazily create) the mutation lock for a session."""
+        lock = self._session_locks.get(session_id)
+        if lock is None:
+            lock = self._session_locks.setdefault(session_id, asyncio.Lock())
+        return lock
 
     def get_or_create_session(self, session_id: Optional[str] = None, mode: AgentMode = AgentMode.HITL) -> SessionState:
         """Get existing session or create new one."""
@@ -76,9 +185,20 @@ class PentestOrchestrator:
         # Get or create session
         agent_mode = AgentMode(mode) if isinstance(mode, str) else mode
         session = self.get_or_create_session(session_id, agent_mode)
-        
+
+        # Serialize per-session work; concurrent sessions still run in parallel
+        async with self._get_session_lock(session.session_id):
+            return await self._handle_request(session, user_prompt, model)
+
+    async def _handle_request(
+        self,
+        session: SessionState,
+        user_prompt: str,
+        model: str
+    ) -> Dict[str, Any]:
+        """Handle a request with the session lock held."""
         # Get LLM Analysis
-        template = self.jinja_env.get_template("orchestrator.jinja2")
+        template = self._orchestrator_tmpl
         prompt_context = {
             "user_prompt": user_prompt,
             "current_target": session.current_target,
@@ -89,18 +209,30 @@ class PentestOrchestrator:
             {"role": "system", "content": "You are a senior penetration testing intent router. You must always respond in JSON format."},
             {"role": "user", "content": system_prompt}
         ]
-        
-        response = await ollama_client.chat(model=model, messages=messages, format="json")
+
+        # Speculative RAG search: the tool query only needs the raw prompt and
+        # the current target, both known before the router returns, so overlap
+        # the embedding+pgvector lookup with the router LLM round-trip.
+        from app.tools.tool_rag import tool_rag
+        speculative_target = session.current_target
+        speculative_query = f"User wants to {user_prompt} on {speculative_target or 'target'}"
+
+        router_task = asyncio.create_task(
+            cached_chat(model=model, messages=messages, format="json")
+        )
+        rag_task = asyncio.create_task(tool_rag.search(speculative_query, k=5))
+        response, speculative_candidates = await asyncio.gather(
+            router_task, rag_task, return_exceptions=True
+        )
+        if isinstance(response, Exception):
+            raise response
+        if isinstance(speculative_candidates, Exception):
+            speculative_candidates = []
         content = response.get("message", {}).get("content", "{}")
         
         # Parse JSON from LLM
         try:
-            # Simple JSON extraction in case of surrounding text
-            json_match = re.search(r"(\{.*\})", content, re.DOTALL)
-            if json_match:
-                analysis = json.loads(json_match.group(1))
-            else:
-                analysis = json.loads(content)
+            analysis = _extract_json(content)
         except Exception as e:
             # If JSON parsing fails, log and try one more time or return error
             print(f"❌ Failed to parse LLM JSON: {e}\nRaw content: {content}")
@@ -124,18 +256,19 @@ class PentestOrchestrator:
                         "session_id": session.session_id
                     }
                 session.current_target = parsed.normalized if isinstance(parsed.normalized, str) else parsed.normalized[0]
-                # Store target in DB and get ID
+                # Store target in DB off the critical path — the ID is only
+                # needed later (if at all) to annotate tool results, so the
+                # insert runs as a background task resolved on demand.
                 from app.schemas.target import TargetCreate
-                try:
-                    # Use metadata_ to be safe with renamed field
-                    target_obj = await memory_manager.store_target(TargetCreate(
+                # The parser already classified the target — no regex needed
+                is_ip = parsed.type == TargetType.IP
+                self._target_tasks[session.session_id] = asyncio.create_task(
+                    memory_manager.store_target(TargetCreate(
                         domain=session.current_target if "." in session.current_target else "unknown",
-                        ip=session.current_target if re.match(r"^\d+\.\d+\.\d+\.\d+$", session.current_target) else None,
+                        ip=session.current_target if is_ip else None,
                         extra_metadata={}
                     ))
-                    session.current_target_id = target_obj.id
-                except Exception as e:
-                    print(f"⚠️ Failed to store target in DB: {e}")
+                )
 
         tasks = analysis.get("tasks", [])
         display_response = analysis.get("response", "Processing your request...")
@@ -153,27 +286,18 @@ class PentestOrchestrator:
         task_description = task.get("description", category)
 
         # Update Phase for Flow Graph
-        if "recon" in category or "subdomain" in category or "discover" in category:
-            session.current_phase = "Reconnaissance"
-        elif "scan" in category or "port" in category:
-            session.current_phase = "Scanning"
-        elif "vuln" in category or "exploit" in category or "attack" in category:
-            session.current_phase = "Exploitation"
-        elif "report" in category:
-            session.current_phase = "Reporting"
-        else:
-            session.current_phase = "Scanning" # Default to scanning if unsure
+        session.current_phase = _classify_phase(category)
 
         # ═══════════════════════════════════════════════════════════════
         # RAG-BASED TOOL SELECTION (replaces hard-coded CATEGORY_TO_TOOL)
         # ═══════════════════════════════════════════════════════════════
-        from app.tools.tool_rag import tool_rag
-        
-        # Build semantic query from intent + target
-        query = f"User wants to {task_description} on {session.current_target or 'target'}"
-        
-        # Retrieve top-5 candidate tools
-        candidates = await tool_rag.search(query, k=5)
+        # Reuse the speculative search unless the router discovered a new
+        # target, in which case the query basis changed and we re-search.
+        if speculative_candidates and session.current_target == speculative_target:
+            candidates = speculative_candidates
+        else:
+            query = f"User wants to {task_description} on {session.current_target or 'target'}"
+            candidates = await tool_rag.search(query, k=5)
         
         if not candidates:
             # Fallback: return LLM response without tool execution
@@ -207,27 +331,32 @@ class PentestOrchestrator:
         # ═══════════════════════════════════════════════════════════════
         # HITL / Auto mode logic - Critical actions ALWAYS require confirmation
         # ═══════════════════════════════════════════════════════════════
-        is_critical = risk_level in ["high", "critical"]
+        is_critical = risk_level in _CONFIRM_RISKS
         needs_confirmation = (session.mode == AgentMode.HITL) or is_critical
         
-        # Build command string via ToolExecutor (robust parameter mapping)
+        # Build command string via ToolExecutor (robust parameter mapping).
+        # The same resolved params are reused for execution (auto mode) and
+        # carried on the PendingAction (HITL), so confirmation runs exactly
+        # the command that was previewed.
         executor = get_executor()
+        exec_params = {**selection.parameters, "target": session.current_target or "target"}
         try:
             command_str = executor.get_command_string(
                 tool_name=tool_name,
                 command_name=command_name or "default",
-                params={**selection.parameters, "target": session.current_target or "target"}
+                params=exec_params
             )
         except Exception as e:
             # Fallback to simple building if spec building fails
             command_str = selection.get_command_string(session.current_target or "target")
-        
+
         if needs_confirmation:
             pending = PendingAction(
                 tool_name=tool_name,
                 target=session.current_target or (analysis["targets"][0] if analysis.get("targets") else "unknown"),
                 command=command_str,
                 description=f"{selection.reasoning}",
+                tool_parameters=exec_params,
                 risk_level=risk_level
             )
             session.set_pending_action(pending)
@@ -244,12 +373,13 @@ class PentestOrchestrator:
         terminal_manager.write_input(f"{command_str}\n")
         
         # In AUTO mode, we execute and analyze synchronously to give immediate feedback
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         try:
-            params = {**selection.parameters, "target": session.current_target or "target"}
+            params = exec_params
             result = await loop.run_in_executor(
-                None, 
-                lambda: executor.execute_tool(
+                self._tool_pool,
+                functools.partial(
+                    executor.execute_tool,
                     tool_name=tool_name,
                     parameters=params,
                     session_id=session.session_id
@@ -263,7 +393,7 @@ class PentestOrchestrator:
                     await memory_manager.store_structured(
                         tool_name=tool_name,
                         parsed_data=result["results"],
-                        target_id=session.current_target_id or session.current_target
+                        target_id=await self._resolve_target_id(session)
                     )
                 
                 # Analyze results
@@ -324,7 +454,20 @@ class PentestOrchestrator:
             }
         
         session = self.sessions[session_id]
-        
+
+        async with self._get_session_lock(session_id):
+            return await self._confirm_action(session, action_id, approved, edited_command)
+
+    async def _confirm_action(
+        self,
+        session: SessionState,
+        action_id: str,
+        approved: bool,
+        edited_command: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Process a confirmation with the session lock held."""
+        session_id = session.session_id
+
         if not session.pending_action:
             return {
                 "type": "error", 
@@ -357,15 +500,20 @@ class PentestOrchestrator:
         terminal_manager.write_input(f"{command}\n")
         
         executor = get_executor()
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         
         try:
-            params = {"target": pending.target, "domain": pending.target, "url": pending.target}
+            # Reuse the parameters resolved at preview time; fall back to the
+            # ad-hoc mapping only for pending actions created before they existed
+            params = pending.tool_parameters or {
+                "target": pending.target, "domain": pending.target, "url": pending.target
+            }
             
             # 1. Execute tool via unified executor (captures output and parses data)
             result = await loop.run_in_executor(
-                None, 
-                lambda: executor.execute_tool(
+                self._tool_pool,
+                functools.partial(
+                    executor.execute_tool,
                     tool_name=pending.tool_name,
                     parameters=params,
                     session_id=session_id
@@ -379,7 +527,7 @@ class PentestOrchestrator:
                     await memory_manager.store_structured(
                         tool_name=pending.tool_name,
                         parsed_data=result["results"],
-                        target_id=session.current_target_id or pending.target # Fallback to target string if no ID
+                        target_id=await self._resolve_target_id(session, fallback=pending.target)
                     )
                 
                 # 3. AI Analysis of the findings
@@ -444,8 +592,7 @@ class PentestOrchestrator:
     ) -> str:
         """Have the AI analyze tool findings and provide insights."""
         try:
-            template = self.jinja_env.get_template("analysis.jinja2")
-            prompt = template.render(
+            prompt = self._analysis_tmpl.render(
                 tool_name=tool_name,
                 command=command,
                 target=target,
@@ -453,10 +600,14 @@ class PentestOrchestrator:
                 parsed_data=result.get("results", {})
             )
             
-            response = await ollama_client.generate(
+            # Evidence signature lets the cache reject stale analysis when the
+            # tool output keys actually changed between runs.
+            evidence_sig = sorted(result.get("results", {}).keys())
+            response = await cached_generate(
                 model=model,
                 prompt=prompt,
-                system="You are a senior penetration tester. Be technical, concise, and professional."
+                system="You are a senior penetration tester. Be technical, concise, and professional.",
+                evidence_sig=evidence_sig
             )
             return response.get("response", "Could not generate analysis.")
         except Exception as e:
@@ -4,8 +4,8 @@ import os
 from dotenv import load_dotenv
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
-from sqlalchemy import Column, String, Integer, Text, DateTime, JSON, func
-from pgvector.sqlalchemy import Vector
+from sqlalchemy import Column, String, Integer, Text, DateTime, JSON, func, Index
+from pgvector.sqlalchemy import Vector, HALFVEC
 
 # Ensure .env is loaded even when running as a script
 load_dotenv()
@@ -23,15 +23,31 @@ if DATABASE_URL.startswith("postgresql://") and "asyncpg" not in DATABASE_URL:
 if "?" in DATABASE_URL:
     DATABASE_URL = DATABASE_URL.split("?")[0]
 
+# Prepared-statement caching: asyncpg's cache saves parse+plan per statement,
+# but must stay disabled when connecting through a transaction-pooling
+# pgbouncer (the Supabase default). Enable via env on direct connections.
+STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "0"))
+
+_connect_args = {
+    "statement_cache_size": STATEMENT_CACHE_SIZE,
+    "prepared_statement_cache_size": STATEMENT_CACHE_SIZE,
+}
+# Short OLTP statements lose more to per-query JIT compilation than they
+# gain — notably pgvector kNN lookups. Sent in the startup packet, which
+# a transaction-pooling pgbouncer rejects, so like the statement cache
+# this is opt-in for direct connections only.
+if os.getenv("DB_DISABLE_JIT", "0") == "1":
+    _connect_args["server_settings"] = {"jit": "off"}
+
 engine = create_async_engine(
-    DATABASE_URL, 
-    echo=False, 
-    pool_size=5, 
-    max_overflow=10,
-    connect_args={
-        "statement_cache_size": 0,
-        "prepared_statement_cache_size": 0
-    }
+    DATABASE_URL,
+    echo=False,
+    # Sized for concurrent scans: batched writers, embedding lookups and
+    # session writes all draw from this pool. Tunable per deployment.
+    pool_size=int(os.getenv("DB_POOL_SIZE", "20")),
+    max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "40")),
+    pool_recycle=1800,
+    connect_args=_connect_args
 )
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
@@ -52,7 +68,15 @@ class Target(Base):
 
 class Port(Base):
     __tablename__ = "ports"
-    
+    __table_args__ = (
+        # Matches query_ports' hottest predicate ("open ports for target X")
+        Index("ix_ports_target_state", "target_id", "state"),
+        # The trigram GIN index on service (for ILIKE '%x%') is created in
+        # init_db, guarded on pg_trgm actually being available — declaring
+        # it here would make create_all fail outright on roles that can't
+        # install extensions
+    )
+
     id = Column(String, primary_key=True)
     target_id = Column(String, nullable=False, index=True)
     ip = Column(String, nullable=False, index=True)
@@ -67,7 +91,11 @@ class Port(Base):
 
 class Finding(Base):
     __tablename__ = "findings"
-    
+    __table_args__ = (
+        # Covers query_findings' target/severity/min-confidence filters
+        Index("ix_findings_target_sev_conf", "target_id", "severity", "confidence"),
+    )
+
     id = Column(String, primary_key=True)
     target_id = Column(String, nullable=False, index=True)
     type = Column(String, nullable=False, index=True)  
@@ -98,18 +126,59 @@ class ToolEmbedding(Base):
     tool_name = Column(String, nullable=False, index=True)
     command_name = Column(String, nullable=True, index=True)  # NULL = tool-level embedding
     description = Column(Text, nullable=False)  # The text that was embedded
-    vector = Column(Vector(768))
+    # BLAKE2b-160 of description; re-indexing skips rows whose hash is
+    # already present instead of re-embedding the whole catalog
+    text_hash = Column(String, nullable=True, index=True)
+    # FP16 halves the bytes the HNSW distance kernel streams per row
+    # (1.5 KB vs 3 KB); recall loss on nomic-embed-text is negligible.
+    # Python still hands over FP32 floats — pgvector narrows server-side.
+    vector = Column(HALFVEC(768))
     risk_level = Column(String, default="low")
     extra_metadata = Column("extra_metadata", JSON, default={})
     created_at = Column(DateTime, server_default=func.now())
 
 
+# HNSW index so the per-request k=5 tool search stays log-time instead of a
+# sequential scan as the catalog grows (created by init_db via create_all).
+Index(
+    "tool_embeddings_vec_hnsw",
+    ToolEmbedding.vector,
+    postgresql_using="hnsw",
+    postgresql_with={"m": 16, "ef_construction": 64},
+    # ip_ops: vectors are L2-normalized at ingest, so inner product ranks
+    # identically to cosine without the per-edge norm/sqrt/divide
+    postgresql_ops={"vector": "halfvec_ip_ops"}
+)
+
+
 # ================== DB UTILITIES ==================
 
 async def init_db():
     """Create all tables."""
+    from sqlalchemy import text as sa_text
+    # Needed by the trigram index on ports.service; own transaction so a
+    # permissions failure doesn't abort table creation
+    trgm_available = True
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(sa_text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    except Exception as e:
+        trgm_available = False
+        print(f"⚠️ pg_trgm extension unavailable: {e}")
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+    # service ILIKE '%x%' needs a trigram GIN index to avoid a seq scan;
+    # built here (not via create_all) so a missing extension only costs
+    # the index, not table creation
+    if trgm_available:
+        try:
+            async with engine.begin() as conn:
+                await conn.execute(sa_text(
+                    "CREATE INDEX IF NOT EXISTS ix_ports_service_trgm "
+                    "ON ports USING gin (service gin_trgm_ops)"
+                ))
+        except Exception as e:
+            print(f"⚠️ trigram index on ports.service skipped: {e}")
 
 
 async def get_session() -> AsyncSession:
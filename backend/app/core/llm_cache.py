@@ -0,0 +1,96 @@
+"""Redis-backed cache for LLM outputs (intent router + result analysis).
+
+Repeat runs of the same scan against the same target re-issue byte-identical
+prompts; caching the responses keyed by a hash of (model, prompt) makes those
+hits near-free and saves the LLM round-trip entirely.
+"""
+
+import hashlib
+from typing import Any, Dict, List, Optional
+
+import orjson
+
+from app.core.ollama import ollama_client
+from app.core.redis import redis_client
+
+CACHE_TTL = 3600  # 1 hour
+EVIDENCE_JACCARD_THRESHOLD = 0.9
+
+
+def _cache_key(*parts: Any) -> str:
+    """Exact-match cache key from model/system/prompt parts."""
+    digest = hashlib.blake2b(orjson.dumps(parts), digest_size=16).hexdigest()
+    return f"llmcache:{digest}"
+
+
+def _jaccard(a: List[str], b: List[str]) -> float:
+    set_a, set_b = set(a), set(b)
+    if not set_a and not set_b:
+        return 1.0
+    union = set_a | set_b
+    if not union:
+        return 1.0
+    return len(set_a & set_b) / len(union)
+
+
+def _evidence_matches(evidence_sig: Optional[List[str]], cached_sig: Optional[List[str]]) -> bool:
+    """Guard against returning stale analysis when tool output changed."""
+    if evidence_sig is None:
+        return True
+    return _jaccard(evidence_sig, cached_sig or []) >= EVIDENCE_JACCARD_THRESHOLD
+
+
+async def cached_chat(
+    model: str,
+    messages: List[Dict[str, str]],
+    format: Optional[str] = None,
+    evidence_sig: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """Chat with exact-match Redis caching. Same signature semantics as ollama_client.chat."""
+    key = _cache_key("chat", model, format, messages)
+    try:
+        cached = await redis_client.get_json(key)
+    except Exception:
+        cached = None
+    if cached and _evidence_matches(evidence_sig, cached.get("evidence_sig")):
+        return cached["response"]
+
+    response = await ollama_client.chat(model=model, messages=messages, format=format)
+    if isinstance(response, dict) and "error" not in response:
+        try:
+            await redis_client.set(
+                key,
+                {"response": response, "evidence_sig": sorted(evidence_sig) if evidence_sig else None},
+                ttl=CACHE_TTL
+            )
+        except Exception:
+            pass
+    return response
+
+
+async def cached_generate(
+    model: str,
+    prompt: str,
+    system: Optional[str] = None,
+    evidence_sig: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """Generate with exact-match Redis caching. Same signature semantics as ollama_client.generate."""
+    key = _cache_key("generate", model, system, prompt)
+    try:
+        cached = await redis_client.get_json(key)
+    except Exception:
+        cached = None
+    if cached and _evidence_matches(evidence_sig, cached.get("evidence_sig")):
+        return cached["response"]
+
+    response = await ollama_client.generate(model=model, prompt=prompt, system=system)
+    if isinstance(response, dict) and "error" not in response:
+        try:
+            await redis_client.set(
+                key,
+                {"response": response, "evidence_sig": sorted(evidence_sig) if evidence_sig else None},
+                ttl=CACHE_TTL
+            )
+        except Exception:
+            pass
+    return response
@@ -1,68 +1,175 @@
+import asyncio
+import hashlib
 import httpx
+import orjson
 import os
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, Awaitable, Callable, List, Dict, Any, Optional
 
 OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
 
 class OllamaClient:
     def __init__(self, base_url: str = OLLAMA_BASE_URL):
         self.base_url = base_url
+        # Lazily created so the client binds to the running event loop
+        self._client: Optional[httpx.AsyncClient] = None
+        # Singleflight map: concurrent identical requests share one Future
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared AsyncClient, creating it on first use.
+
+        A single long-lived client keeps connections alive (HTTP/2 + keep-alive
+        pool) instead of paying TCP/TLS handshake cost on every LLM call.
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                http2=True,
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+                headers={"Accept-Encoding": "zstd, gzip"}
+            )
+        return self._client
+
+    async def _singleflight(self, key: str, do_request: Callable[[], Awaitable[Any]]) -> Any:
+        """Coalesce concurrent identical requests onto one in-flight call."""
+        fut = self._inflight.get(key)
+        if fut is not None:
+            return await fut
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[key] = fut
+        try:
+            result = await do_request()
+            fut.set_result(result)
+            return result
+        except Exception as e:
+            fut.set_exception(e)
+            fut.exception()  # mark retrieved in case no other caller is waiting
+            raise
+        finally:
+            # CancelledError skips the except clause above; if the leader was
+            # cancelled (client disconnect), cancel the future too so waiting
+            # followers fail fast instead of awaiting it forever
+            if not fut.done():
+                fut.cancel()
+            self._inflight.pop(key, None)
+
+    @staticmethod
+    def _request_key(*parts: Any) -> str:
+        return hashlib.blake2b(orjson.dumps(parts), digest_size=16).hexdigest()
+
+    async def aclose(self):
+        """Close the shared client (wired into FastAPI shutdown)."""
+        if self._client and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+    async def list_models_raw(self) -> Dict[str, Any]:
+        """Raw /api/tags payload (raises on transport errors)."""
+        response = await self._get_client().get("/api/tags")
+        response.raise_for_status()
+        return response.json()
 
     async def list_models(self) -> List[str]:
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"{self.base_url}/api/tags")
-                if response.status_code == 200:
-                    data = response.json()
-                    return [m['name'] for m in data.get('models', [])]
-                return []
+            data = await self.list_models_raw()
+            return [m['name'] for m in data.get('models', [])]
         except Exception:
             return []
 
     async def generate(self, model: str, prompt: str, system: Optional[str] = None, format: Optional[str] = None):
+        key = self._request_key("generate", model, prompt, system, format)
+        return await self._singleflight(
+            key, lambda: self._generate_once(model, prompt, system, format)
+        )
+
+    async def _generate_once(self, model: str, prompt: str, system: Optional[str] = None, format: Optional[str] = None):
         try:
-            async with httpx.AsyncClient() as client:
-                payload = {
-                    "model": model,
-                    "prompt": prompt,
-                    "stream": False
-                }
-                if system:
-                    payload["system"] = system
-                if format:
-                    payload["format"] = format
-                    
-                response = await client.post(
-                    f"{self.base_url}/api/generate",
-                    json=payload,
-                    timeout=120.0
-                )
-                if response.status_code == 200:
-                    return response.json()
-                return {"error": f"Failed with status {response.status_code}"}
+            payload = {
+                "model": model,
+                "prompt": prompt,
+                "stream": False
+            }
+            if system:
+                payload["system"] = system
+            if format:
+                payload["format"] = format
+
+            response = await self._get_client().post(
+                "/api/generate",
+                json=payload,
+                timeout=120.0
+            )
+            if response.status_code == 200:
+                return response.json()
+            return {"error": f"Failed with status {response.status_code}"}
         except Exception as e:
             return {"error": str(e)}
 
     async def chat(self, model: str, messages: List[Dict[str, str]], stream: bool = False, format: Optional[str] = None):
+        key = self._request_key("chat", model, messages, stream, format)
+        return await self._singleflight(
+            key, lambda: self._chat_once(model, messages, stream, format)
+        )
+
+    async def _chat_once(self, model: str, messages: List[Dict[str, str]], stream: bool = False, format: Optional[str] = None):
         try:
-            async with httpx.AsyncClient() as client:
-                payload = {
-                    "model": model,
-                    "messages": messages,
-                    "stream": stream
-                }
-                if format:
-                    payload["format"] = format
-                    
-                response = await client.post(
-                    f"{self.base_url}/api/chat",
-                    json=payload,
-                    timeout=60.0
-                )
-                if response.status_code == 200:
-                    return response.json()
-                return {"error": "Failed to get response from Ollama"}
+            payload = {
+                "model": model,
+                "messages": messages,
+                "stream": stream
+            }
+            if format:
+                payload["format"] = format
+
+            response = await self._get_client().post(
+                "/api/chat",
+                json=payload,
+                timeout=60.0
+            )
+            if response.status_code == 200:
+                return response.json()
+            return {"error": "Failed to get response from Ollama"}
         except Exception as e:
             return {"error": str(e)}
 
+    async def chat_stream(
+        self, model: str, messages: List[Dict[str, str]], format: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream chat chunks as they are generated (one JSON object per line)."""
+        payload = {
+            "model": model,
+            "messages": messages,
+            "stream": True
+        }
+        if format:
+            payload["format"] = format
+
+        async with self._get_client().stream(
+            "POST", "/api/chat", json=payload, timeout=60.0
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if line:
+                    yield orjson.loads(line)
+
+    async def generate_stream(
+        self, model: str, prompt: str, system: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream generate chunks as they are generated (one JSON object per line)."""
+        payload = {
+            "model": model,
+            "prompt": prompt,
+            "stream": True
+        }
+        if system:
+            payload["system"] = system
+
+        async with self._get_client().stream(
+            "POST", "/api/generate", json=payload, timeout=120.0
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if line:
+                    yield orjson.loads(line)
+
 ollama_client = OllamaClient()
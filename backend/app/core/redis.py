@@ -7,8 +7,10 @@ import orjson
 
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
 
-# Connection pool
+# Connection pools: text for plain strings, binary for orjson blobs so JSON
+# values skip the bytes→str→bytes round-trip on both set and get
 pool = redis.ConnectionPool.from_url(REDIS_URL, decode_responses=True)
+binary_pool = redis.ConnectionPool.from_url(REDIS_URL, decode_responses=False)
 
 
 class RedisClient:
@@ -16,20 +18,25 @@ class RedisClient:
     
     def __init__(self):
         self.client = redis.Redis(connection_pool=pool)
-    
+        self.binary = redis.Redis(connection_pool=binary_pool)
+        # Keys whose TTL has already been set this process — lets the stdout
+        # hot path skip the EXPIRE round-trip after the first append
+        self._expire_set: set = set()
+
     async def set(self, key: str, value: Any, ttl: int = 3600) -> bool:
         """Set value with TTL (default 1 hour)."""
         if isinstance(value, (dict, list)):
-            value = orjson.dumps(value).decode()
+            # orjson bytes go out as-is over the binary client
+            return await self.binary.set(key, orjson.dumps(value), ex=ttl)
         return await self.client.set(key, value, ex=ttl)
-    
+
     async def get(self, key: str) -> Optional[str]:
         """Get value by key."""
         return await self.client.get(key)
-    
+
     async def get_json(self, key: str) -> Optional[dict]:
-        """Get and parse JSON value."""
-        data = await self.client.get(key)
+        """Get and parse JSON value (orjson consumes the raw bytes directly)."""
+        data = await self.binary.get(key)
         if data:
             return orjson.loads(data)
         return None
@@ -69,10 +76,21 @@ class RedisClient:
     # =============== TOOL STDOUT ===============
     
     async def append_tool_stdout(self, scan_id: str, tool_name: str, line: str):
-        """Append line to tool stdout buffer."""
+        """Append line to tool stdout buffer.
+
+        This is the highest-frequency Redis call (one per output line of a
+        scan), so the TTL is only refreshed on the first append per key and
+        both commands go out in a single pipelined round-trip.
+        """
         key = f"scan:{scan_id}:tool:{tool_name}:stdout"
-        await self.client.rpush(key, line)
-        await self.client.expire(key, 3600)
+        if key in self._expire_set:
+            await self.client.rpush(key, line)
+            return
+        async with self.client.pipeline(transaction=False) as p:
+            p.rpush(key, line)
+            p.expire(key, 3600)
+            await p.execute()
+        self._expire_set.add(key)
     
     async def get_tool_stdout(self, scan_id: str, tool_name: str, limit: int = 100) -> list:
         """Get tool stdout lines."""
@@ -2,13 +2,28 @@ import os
 import pty
 import subprocess
 import asyncio
+import codecs
 from typing import Callable
 
+# Per-wakeup read size: chatty tools (nmap -v, ffuf) emit bursts far larger
+# than 1 KiB, and each os.read is a syscall — 64 KiB keeps syscall count low.
+READ_CHUNK_SIZE = 65536
+
+# Env vars passed to the spawned shell — a whitelist instead of a full
+# os.environ copy keeps the execve envp block small and avoids leaking
+# backend secrets (API keys, DATABASE_URL) into the interactive shell.
+_SHELL_ENV_KEYS = ("PATH", "HOME", "TERM", "LANG", "USER", "SHELL", "LC_ALL")
+
 class TerminalManager:
     def __init__(self):
         self.master_fd = None
         self.shell_process = None
         self.loop = None
+        self._out_queue = None
+        self._consumer = None
+        # Incremental decoder buffers multi-byte codepoints split across
+        # reads instead of silently dropping them at chunk boundaries
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
 
     def start_shell(self, output_callback: Callable[[str], None]):
         """Starts a bash shell in a pty and pipes output to callback using asyncio."""
@@ -27,7 +42,7 @@ class TerminalManager:
                 stdout=slave_fd,
                 stderr=slave_fd,
                 preexec_fn=os.setsid,
-                env=os.environ.copy()
+                env={k: os.environ[k] for k in _SHELL_ENV_KEYS if k in os.environ}
             )
             print(f"🐚 [Terminal] Shell PID: {self.shell_process.pid}")
             
@@ -37,23 +52,46 @@ class TerminalManager:
             # Set master_fd to non-blocking
             os.set_blocking(self.master_fd, False)
             
+            # One long-lived consumer task pulls from the queue — preserves
+            # output ordering and avoids a task allocation per PTY read
+            self._out_queue = asyncio.Queue()
+            self._consumer = self.loop.create_task(self._consume(output_callback))
+
             # Register reader with asyncio loop
-            self.loop.add_reader(self.master_fd, self._read_output, output_callback)
+            self.loop.add_reader(self.master_fd, self._read_output)
             print("🐚 [Terminal] Asyncio reader registered")
         except Exception as e:
             print(f"❌ [Terminal] Error starting shell: {e}")
             self.stop()
 
-    def _read_output(self, callback):
-        """Callback for asyncio reader."""
+    def _read_output(self):
+        """Callback for asyncio reader. Drains the PTY until EAGAIN so a burst
+        of output costs a handful of large reads and one decode, not one
+        syscall + bytes + task per 1 KiB."""
         try:
-            data = os.read(self.master_fd, 1024).decode('utf-8', errors='ignore')
-            if data:
-                asyncio.create_task(callback(data))
+            chunks = []
+            while True:
+                try:
+                    data = os.read(self.master_fd, READ_CHUNK_SIZE)
+                except BlockingIOError:
+                    break
+                if not data:
+                    break
+                chunks.append(data)
+            if chunks:
+                text = self._decoder.decode(b"".join(chunks), final=False)
+                if text:
+                    self._out_queue.put_nowait(text)
         except (OSError, ValueError) as e:
             print(f"⚠️ [Terminal] Read error or EOF: {e}")
             self.stop()
 
+    async def _consume(self, callback: Callable[[str], None]):
+        """Forward queued PTY output to the websocket callback, in order."""
+        while True:
+            data = await self._out_queue.get()
+            await callback(data)
+
     def write_input(self, data: str):
         """Writes input data to the master_fd."""
         if self.master_fd:
@@ -67,10 +105,20 @@ class TerminalManager:
         print("🐚 [Terminal] Stopping shell...")
         if self.master_fd and self.loop:
             self.loop.remove_reader(self.master_fd)
+
+        # Flush any buffered partial codepoint and reset for the next shell
+        tail = self._decoder.decode(b'', final=True)
+        if tail and self._out_queue is not None:
+            self._out_queue.put_nowait(tail)
+        self._decoder.reset()
         
+        if self._consumer:
+            self._consumer.cancel()
+            self._consumer = None
+
         if self.shell_process:
             self.shell_process.terminate()
-            
+
         if self.master_fd:
             try:
                 os.close(self.master_fd)
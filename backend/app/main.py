@@ -14,6 +14,7 @@ load_dotenv(os.path.join(BASE_DIR, ".env"))
 
 from app.agents.orchestrator import orchestrator
 from app.core.database import init_db
+from app.core.ollama import ollama_client
 from app.core.redis import redis_client
 from app.core.terminal import terminal_manager
 
@@ -26,6 +27,9 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         print(f"⚠️ Database init skipped: {e}")
     yield
+    await ollama_client.aclose()
+    from app.tools.tool_rag import tool_rag
+    await tool_rag.aclose()
 
 app = FastAPI(title="Firestarter AI Backend", version="2.0.0", lifespan=lifespan)
 
@@ -65,26 +69,29 @@ class SwitchModeRequest(BaseModel):
 async def root():
     return {"status": "online", "message": "Firestarter AI Backend is running"}
 
-@app.get("/api/health")
-async def health():
-    """Health check with DB/Redis status."""
-    db_status = "unknown"
-    redis_status = "unknown"
-    
+async def _check_db() -> str:
     try:
         from app.core.database import engine
         async with engine.connect() as conn:
-            await conn.execute("SELECT 1")
-        db_status = "connected"
+            await conn.exec_driver_sql("SELECT 1")
+        return "connected"
     except Exception as e:
-        db_status = f"error: {str(e)[:50]}"
-    
+        return f"error: {str(e)[:50]}"
+
+
+async def _check_redis() -> str:
     try:
         await redis_client.client.ping()
-        redis_status = "connected"
+        return "connected"
     except Exception as e:
-        redis_status = f"error: {str(e)[:50]}"
-    
+        return f"error: {str(e)[:50]}"
+
+
+@app.get("/api/health")
+async def health():
+    """Health check with DB/Redis status (probes run concurrently)."""
+    db_status, redis_status = await asyncio.gather(_check_db(), _check_redis())
+
     return {
         "status": "online",
         "database": db_status,
@@ -103,14 +110,11 @@ async def get_targets():
 
 @app.get("/api/models")
 async def get_models():
-    """Fetch available models from local Ollama."""
+    """Fetch available models from local Ollama (shared keep-alive client)."""
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{OLLAMA_BASE_URL}/api/tags")
-            if response.status_code == 200:
-                return response.json()
-            else:
-                raise HTTPException(status_code=response.status_code, detail="Failed to fetch models from Ollama")
+        return await ollama_client.list_models_raw()
+    except httpx.HTTPStatusError as e:
+        raise HTTPException(status_code=e.response.status_code, detail="Failed to fetch models from Ollama")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
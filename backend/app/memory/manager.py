@@ -1,9 +1,12 @@
 """Unified Memory Manager - Agent never queries DB directly."""
 
-import uuid
-from typing import Optional, List, Dict, Any
-from sqlalchemy import select, and_
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import Optional, List, Dict, Any, Tuple
+from sqlalchemy import select, and_, insert, text, bindparam, Integer
 from sqlalchemy.ext.asyncio import AsyncSession
+from pgvector.sqlalchemy import Vector
 
 from app.core.database import async_session, Port as PortModel, Finding as FindingModel, Target as TargetModel, Embedding as EmbeddingModel
 from app.core.redis import redis_client
@@ -12,6 +15,38 @@ from app.schemas.finding import Finding, FindingCreate, FindingQuery
 from app.schemas.target import Target, TargetCreate
 
 
+def _new_id() -> str:
+    """Random 128-bit hex ID — skips the uuid4 object and dashed formatter."""
+    return os.urandom(16).hex()
+
+
+def _construct(schema_cls, row):
+    """Build a schema from a trusted ORM row, skipping validation.
+
+    Rows read back from our own tables were validated on the way in, so the
+    query paths use model_construct and avoid per-row validator dispatch.
+    """
+    return schema_cls.model_construct(
+        **{f: getattr(row, f) for f in schema_cls.model_fields}
+    )
+
+
+# Precompiled semantic-search statement: binding the vector with its real
+# pgvector type (instead of stringifying the Python list) skips a per-call
+# format/parse round and lets asyncpg cache the prepared statement. Needs an
+# HNSW/IVFFlat index on embeddings.vector for the ORDER BY to use index scan.
+_SEMANTIC_SEARCH_STMT = text("""
+    SELECT id, object_type, object_id, extra_metadata,
+           1 - (vector <=> :query_vector) as similarity
+    FROM embeddings
+    ORDER BY vector <=> :query_vector
+    LIMIT :k
+""").bindparams(
+    bindparam("query_vector", type_=Vector(768)),
+    bindparam("k", type_=Integer())
+)
+
+
 class MemoryManager:
     """Abstraction layer for agent memory.
     
@@ -20,7 +55,57 @@ class MemoryManager:
     - Vector (pgvector): tool embeddings.
     - RAG
     """
-    
+
+    # Write-behind batching knobs for structured tool output
+    WRITE_BATCH_SIZE = 100
+    WRITE_BATCH_WINDOW = 0.05  # seconds
+
+    def __init__(self):
+        self._write_queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+
+    # ================== WRITE-BEHIND BUFFER ==================
+
+    def _ensure_writer(self):
+        """Start the background write drainer on first use (binds to the running loop)."""
+        if self._writer_task is None or self._writer_task.done():
+            self._write_queue = asyncio.Queue(maxsize=10000)
+            self._writer_task = asyncio.get_running_loop().create_task(self._drain_writes())
+
+    async def _drain_writes(self):
+        """Accumulate queued rows into batches and insert them with executemany."""
+        loop = asyncio.get_running_loop()
+        while True:
+            model, row = await self._write_queue.get()
+            batch: Dict[Any, List[dict]] = {model: [row]}
+            count = 1
+            deadline = loop.time() + self.WRITE_BATCH_WINDOW
+            while count < self.WRITE_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    model, row = await asyncio.wait_for(self._write_queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.setdefault(model, []).append(row)
+                count += 1
+            try:
+                async with self._session_scope() as session:
+                    for mdl, rows in batch.items():
+                        await session.execute(insert(mdl), rows)
+                    await session.commit()
+            except Exception as e:
+                print(f"⚠️ Batched DB write failed ({count} rows): {e}")
+            finally:
+                for _ in range(count):
+                    self._write_queue.task_done()
+
+    async def flush_writes(self):
+        """Wait until all queued writes have been committed."""
+        if self._write_queue is not None:
+            await self._write_queue.join()
+
     # ================== SHORT-TERM (Redis) ==================
     
     async def set_session_context(self, session_id: str, context: dict):
@@ -48,53 +133,66 @@ class MemoryManager:
         return await redis_client.get_tool_stdout(scan_id, tool_name, limit)
     
     # ================== LONG-TERM (PostgreSQL) ==================
-    
+
+    @asynccontextmanager
+    async def _session_scope(self):
+        """Check out one session for a logical operation.
+
+        Single entry point for DB access so pool checkout happens once per
+        operation, not once per statement.
+        """
+        async with async_session() as session:
+            yield session
+
+    async def _insert_returning(self, model_cls: Any, rows: List[dict]) -> List[Any]:
+        """Insert rows via one executemany INSERT ... RETURNING.
+
+        asyncpg pipelines this as a single prepared statement with a parameter
+        array, and server defaults (created_at) come back with the rows — no
+        per-row refresh SELECT needed.
+        """
+        async with self._session_scope() as session:
+            result = await session.execute(insert(model_cls).returning(model_cls), rows)
+            await session.commit()
+            return result.scalars().all()
+
     # --- Targets ---
     async def store_target(self, data: TargetCreate) -> Target:
         """Store a target in PostgreSQL."""
-        async with async_session() as session:
-            target = TargetModel(
-                id=str(uuid.uuid4()),
-                domain=data.domain,
-                ip=data.ip,
-                extra_metadata=data.extra_metadata
-            )
-            session.add(target)
-            await session.commit()
-            await session.refresh(target)
-            return Target.model_validate(target)
+        rows = await self._insert_returning(TargetModel, [{
+            "id": _new_id(),
+            "domain": data.domain,
+            "ip": data.ip,
+            "extra_metadata": data.extra_metadata
+        }])
+        return Target.model_validate(rows[0])
     
     async def list_targets(self) -> List[Target]:
         """Get all targets from PostgreSQL."""
-        async with async_session() as session:
+        async with self._session_scope() as session:
             stmt = select(TargetModel).order_by(TargetModel.created_at.desc())
-            result = await session.execute(stmt)
-            targets = result.scalars().all()
-            return [Target.model_validate(t) for t in targets]
+            result = await session.stream_scalars(stmt)
+            return [_construct(Target, t) async for t in result]
 
     # --- Ports ---
     async def store_port(self, data: PortCreate) -> Port:
         """Store a port in PostgreSQL."""
-        async with async_session() as session:
-            port = PortModel(
-                id=str(uuid.uuid4()),
-                target_id=data.target_id,
-                ip=data.ip,
-                port=data.port,
-                protocol=data.protocol,
-                state=data.state,
-                service=data.service,
-                version=data.version,
-                source_tool=data.source_tool
-            )
-            session.add(port)
-            await session.commit()
-            await session.refresh(port)
-            return Port.model_validate(port)
+        rows = await self._insert_returning(PortModel, [{
+            "id": _new_id(),
+            "target_id": data.target_id,
+            "ip": data.ip,
+            "port": data.port,
+            "protocol": data.protocol,
+            "state": data.state,
+            "service": data.service,
+            "version": data.version,
+            "source_tool": data.source_tool
+        }])
+        return Port.model_validate(rows[0])
     
     async def query_ports(self, filters: PortQuery) -> List[Port]:
         """Query ports from PostgreSQL."""
-        async with async_session() as session:
+        async with self._session_scope() as session:
             stmt = select(PortModel)
             conditions = []
             
@@ -112,32 +210,27 @@ class MemoryManager:
             if conditions:
                 stmt = stmt.where(and_(*conditions))
             
-            result = await session.execute(stmt)
-            ports = result.scalars().all()
-            return [Port.model_validate(p) for p in ports]
+            result = await session.stream_scalars(stmt)
+            return [_construct(Port, p) async for p in result]
     
     # --- Findings ---
     async def store_finding(self, data: FindingCreate) -> Finding:
         """Store a finding in PostgreSQL."""
-        async with async_session() as session:
-            finding = FindingModel(
-                id=str(uuid.uuid4()),
-                target_id=data.target_id,
-                type=data.type,
-                value=data.value,
-                severity=data.severity,
-                confidence=data.confidence,
-                source_tool=data.source_tool,
-                extra_metadata=data.extra_metadata
-            )
-            session.add(finding)
-            await session.commit()
-            await session.refresh(finding)
-            return Finding.model_validate(finding)
+        rows = await self._insert_returning(FindingModel, [{
+            "id": _new_id(),
+            "target_id": data.target_id,
+            "type": data.type,
+            "value": data.value,
+            "severity": data.severity,
+            "confidence": data.confidence,
+            "source_tool": data.source_tool,
+            "extra_metadata": data.extra_metadata
+        }])
+        return Finding.model_validate(rows[0])
     
     async def query_findings(self, filters: FindingQuery) -> List[Finding]:
         """Query findings from PostgreSQL."""
-        async with async_session() as session:
+        async with self._session_scope() as session:
             stmt = select(FindingModel)
             conditions = []
             
@@ -153,59 +246,59 @@ class MemoryManager:
             if conditions:
                 stmt = stmt.where(and_(*conditions))
             
-            result = await session.execute(stmt)
-            findings = result.scalars().all()
-            return [Finding.model_validate(f) for f in findings]
+            result = await session.stream_scalars(stmt)
+            return [_construct(Finding, f) async for f in result]
     
     # ================== STRUCTURED STORAGE ==================
     
     async def store_structured(self, tool_name: str, parsed_data: dict, target_id: str):
         """Store structured tool output into appropriate tables.
-        
-        This is the main entry point for storing parsed tool results.
+
+        This is the main entry point for storing parsed tool results. Rows go
+        through the write-behind queue and are flushed in batches by the
+        background drainer, so callers do not pay a DB round-trip per row.
+
+        Parser output is trusted, so rows deliberately skip the
+        PortCreate/FindingCreate Pydantic hop — that validation is reserved
+        for the API-surface store_port/store_finding entry points.
         """
+        self._ensure_writer()
+
         # Ports
-        ports = parsed_data.get("ports", [])
-        for port_data in ports:
-            await self.store_port(PortCreate(
-                target_id=target_id,
-                ip=port_data.get("ip", ""),
-                port=port_data.get("port", 0),
-                protocol=port_data.get("protocol", "tcp"),
-                state=port_data.get("state", "open"),
-                service=port_data.get("service"),
-                version=port_data.get("version"),
-                source_tool=tool_name
-            ))
-        
+        for port_data in parsed_data.get("ports", []):
+            await self._write_queue.put((PortModel, {
+                "id": _new_id(),
+                "target_id": target_id,
+                "ip": port_data.get("ip", ""),
+                "port": port_data.get("port", 0),
+                "protocol": port_data.get("protocol", "tcp"),
+                "state": port_data.get("state", "open"),
+                "service": port_data.get("service"),
+                "version": port_data.get("version"),
+                "source_tool": tool_name
+            }))
+
         # Findings (subdomains, vulns, etc.)
-        findings = parsed_data.get("findings", [])
-        for finding_data in findings:
-            await self.store_finding(FindingCreate(
-                target_id=target_id,
-                type=finding_data.get("type", "info"),
-                value=finding_data.get("value", ""),
-                severity=finding_data.get("severity", "info"),
-                confidence=finding_data.get("confidence", 80),
-                source_tool=tool_name,
-                metadata=finding_data.get("metadata", {})
-            ))
+        for finding_data in parsed_data.get("findings", []):
+            await self._write_queue.put((FindingModel, {
+                "id": _new_id(),
+                "target_id": target_id,
+                "type": finding_data.get("type", "info"),
+                "value": finding_data.get("value", ""),
+                "severity": finding_data.get("severity", "info"),
+                "confidence": finding_data.get("confidence", 80),
+                "source_tool": tool_name,
+                "extra_metadata": finding_data.get("metadata", {})
+            }))
     
     # ================== SEMANTIC SEARCH (pgvector) ==================
     
     async def semantic_search(self, query_vector: List[float], k: int = 5) -> List[dict]:
         """Semantic search using pgvector."""
-        async with async_session() as session:
-            # Using raw SQL for pgvector cosine similarity
-            from sqlalchemy import text
-            stmt = text("""
-                SELECT id, object_type, object_id, metadata, 
-                       1 - (vector <=> :query_vector) as similarity
-                FROM embeddings
-                ORDER BY vector <=> :query_vector
-                LIMIT :k
-            """)
-            result = await session.execute(stmt, {"query_vector": str(query_vector), "k": k})
+        async with self._session_scope() as session:
+            result = await session.execute(
+                _SEMANTIC_SEARCH_STMT, {"query_vector": query_vector, "k": k}
+            )
             rows = result.fetchall()
             return [{"id": r[0], "object_type": r[1], "object_id": r[2], 
                      "metadata": r[3], "similarity": r[4]} for r in rows]
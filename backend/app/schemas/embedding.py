@@ -1,7 +1,8 @@
 """Pydantic schemas for Embedding data."""
 
-from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any, List
+from array import array
+from pydantic import BaseModel, Field, field_serializer, field_validator
+from typing import Optional, Dict, Any
 from datetime import datetime
 
 
@@ -9,9 +10,23 @@ class EmbeddingBase(BaseModel):
     """Base embedding schema."""
     object_type: str  # finding, port, vuln, subdomain
     object_id: str
-    vector: List[float]
+    # Stored as a packed array('f'): 4 bytes per dimension in one contiguous
+    # buffer instead of a list of boxed Python floats (~28x larger for a
+    # 768-dim vector). pgvector accepts it directly via .tolist().
+    vector: Any
     extra_metadata: Dict[str, Any] = Field(default_factory=dict)
 
+    @field_validator("vector", mode="before")
+    @classmethod
+    def _pack_vector(cls, v: Any) -> array:
+        if isinstance(v, array) and v.typecode == "f":
+            return v
+        return array("f", v)
+
+    @field_serializer("vector")
+    def _unpack_vector(self, v: array) -> list:
+        return v.tolist()
+
 
 class EmbeddingCreate(EmbeddingBase):
     """Schema for creating an embedding."""
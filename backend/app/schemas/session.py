@@ -1,7 +1,7 @@
 """Session state schemas for Firestarter AI."""
 
 from enum import Enum
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from pydantic import BaseModel, Field
 from datetime import datetime
 import uuid
@@ -23,11 +23,15 @@ class RiskLevel(str, Enum):
 
 class PendingAction(BaseModel):
     """Action waiting for user confirmation (HITL mode)."""
-    action_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    action_id: str = Field(default_factory=lambda: uuid.uuid4().hex)
     tool_name: str
     target: str
     command: str
     description: str
+    tool_parameters: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="Resolved executor parameters, reused on confirmation"
+    )
     risk_level: RiskLevel = RiskLevel.LOW
     estimated_time: Optional[str] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -45,7 +49,7 @@ class ActionConfirmation(BaseModel):
 
 class SessionState(BaseModel):
     """Session state for a chat session."""
-    session_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    session_id: str = Field(default_factory=lambda: uuid.uuid4().hex)
     mode: AgentMode = AgentMode.HITL
     current_target: Optional[str] = None
     current_target_id: Optional[str] = None
@@ -0,0 +1,5 @@
+# Target parsing and validation module
+from .parser import TargetParser, TargetType, ParsedTarget
+from .validator import TargetValidator
+
+__all__ = ["TargetParser", "TargetType", "ParsedTarget", "TargetValidator"]
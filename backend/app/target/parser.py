@@ -0,0 +1,157 @@
+"""Target parsing module for Firestarter AI."""
+
+import ipaddress
+import re
+from enum import Enum
+from typing import Optional, Union, List
+from pydantic import BaseModel
+from urllib.parse import urlparse
+
+
+class TargetType(str, Enum):
+    """Types of targets that can be parsed."""
+    IP = "ip"
+    DOMAIN = "domain"
+    URL = "url"
+    IP_RANGE = "ip_range"
+    SUBDOMAIN_LIST = "subdomain_list"
+    AMBIGUOUS = "ambiguous"
+
+
+class ParsedTarget(BaseModel):
+    """Parsed and validated target information."""
+    raw: str
+    type: TargetType
+    normalized: Union[str, List[str]]
+    is_valid: bool
+    error: Optional[str] = None
+
+    class Config:
+        use_enum_values = True
+
+
+class TargetParser:
+    """Parse and validate target inputs (IP, domain, URL, etc.)."""
+
+    # Regex pattern (domains only — IPs/CIDR go through the C-backed
+    # ipaddress module, URLs through a prefix check). Matched with
+    # fullmatch(), so no explicit ^/$ anchors needed.
+    DOMAIN_PATTERN = re.compile(
+        r"(?:[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?\.)+[a-zA-Z]{2,}"
+    )
+
+    def parse(self, raw: str) -> ParsedTarget:
+        """
+        Parse a raw target string and determine its type.
+        
+        Args:
+            raw: Raw target string from user input
+            
+        Returns:
+            ParsedTarget with type, normalized value, and validation status
+        """
+        raw = raw.strip()
+
+        if not raw:
+            return ParsedTarget(
+                raw=raw,
+                type=TargetType.AMBIGUOUS,
+                normalized=raw,
+                is_valid=False,
+                error="Empty target provided"
+            )
+
+        # First-character dispatch: only digit-leading inputs can be IPs or
+        # CIDR ranges, so everything else skips those checks entirely
+        if raw[0].isdigit():
+            if "/" in raw:
+                try:
+                    ipaddress.ip_network(raw, strict=False)
+                    return ParsedTarget(
+                        raw=raw,
+                        type=TargetType.IP_RANGE,
+                        normalized=raw,
+                        is_valid=True
+                    )
+                except ValueError:
+                    pass  # digit-leading domain like 1and1.com — fall through
+            else:
+                try:
+                    ipaddress.ip_address(raw)
+                    return ParsedTarget(
+                        raw=raw,
+                        type=TargetType.IP,
+                        normalized=raw,
+                        is_valid=True
+                    )
+                except ValueError:
+                    pass
+
+        # Check for URL
+        if raw[:8].lower().startswith(("http://", "https://")):
+            try:
+                parsed_url = urlparse(raw)
+                domain = parsed_url.netloc
+                # Remove port if present
+                if ":" in domain:
+                    domain = domain.split(":")[0]
+                return ParsedTarget(
+                    raw=raw,
+                    type=TargetType.URL,
+                    normalized=domain.lower(),
+                    is_valid=True
+                )
+            except Exception:
+                return ParsedTarget(
+                    raw=raw,
+                    type=TargetType.AMBIGUOUS,
+                    normalized=raw,
+                    is_valid=False,
+                    error="Invalid URL format"
+                )
+
+        # Check for domain
+        if self.DOMAIN_PATTERN.fullmatch(raw):
+            return ParsedTarget(
+                raw=raw,
+                type=TargetType.DOMAIN,
+                normalized=raw.lower(),
+                is_valid=True
+            )
+
+        # Ambiguous - cannot determine type
+        return ParsedTarget(
+            raw=raw,
+            type=TargetType.AMBIGUOUS,
+            normalized=raw,
+            is_valid=False,
+            error=f"Cannot determine target type for: {raw}. Please specify a valid IP, domain, or URL."
+        )
+
+    def parse_list(self, raw_list: List[str]) -> List[ParsedTarget]:
+        """Parse a list of targets.
+
+        Bulk inputs (pasted subdomain dumps, merged tool outputs) commonly
+        repeat entries, so results are memoized per distinct string — each
+        unique target is classified exactly once.
+        """
+        parse = self.parse
+        cache: dict = {}
+        results = []
+        for item in raw_list:
+            parsed = cache.get(item)
+            if parsed is None:
+                parsed = cache[item] = parse(item)
+            results.append(parsed)
+        return results
+
+    def extract_domain_from_url(self, url: str) -> Optional[str]:
+        """Extract domain from a URL string."""
+        try:
+            parsed = urlparse(url)
+            domain = parsed.netloc
+            if ":" in domain:
+                domain = domain.split(":")[0]
+            return domain.lower() if domain else None
+        except Exception:
+            return None
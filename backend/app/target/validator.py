@@ -0,0 +1,205 @@
+"""Target validation module for Firestarter AI."""
+
+import functools
+import os
+from typing import Tuple, List, Optional
+from .parser import ParsedTarget
+
+
+class TargetValidator:
+    """
+    Validate targets against blacklist.
+    
+    Blacklist is loaded from a markdown file with the following format:
+    ```
+    # Blacklist Targets
+    - example.com
+    - *.gov
+    - 192.168.1.0/24
+    ```
+    """
+
+    # Default blocked TLDs (always blocked regardless of blacklist file)
+    DEFAULT_BLOCKED_TLDS = (".gov", ".mil")
+
+    def __init__(self, blacklist_path: Optional[str] = None):
+        """
+        Initialize validator with optional blacklist file.
+        
+        Args:
+            blacklist_path: Path to blacklist.md file. If None, uses default path.
+        """
+        if blacklist_path is None:
+            # Default path: backend/app/config/blacklist.md
+            base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            blacklist_path = os.path.join(base_dir, "config", "blacklist.md")
+        
+        self.blacklist_path = blacklist_path
+        self.blacklist: List[str] = []
+        # Reverse-label trie (nested dicts, TLD at the root). Lookup cost is
+        # O(labels in the target) regardless of blacklist size, vs the old
+        # linear scan over every entry. None keys mark terminal nodes.
+        self._trie: dict = {}
+        # Same target strings recur across tool invocations; memoize verdicts.
+        # The version counter is part of the cache key, so blacklist reloads
+        # and additions invalidate stale entries by natural cache miss.
+        self._version = 0
+        self._check_cached = functools.lru_cache(maxsize=4096)(self._check_uncached)
+        # (mtime_ns, size) of the file behind the current in-memory blacklist;
+        # lets speculative reloads no-op when nothing changed on disk
+        self._loaded_stat = None
+        self._load_blacklist()
+
+    def _load_blacklist(self) -> None:
+        """Load blacklist from markdown file (no-op if the file is unchanged)."""
+        try:
+            st = os.stat(self.blacklist_path)
+        except OSError:
+            self.blacklist = []
+            self._loaded_stat = None
+            self._build_trie()
+            return
+
+        if (st.st_mtime_ns, st.st_size) == self._loaded_stat:
+            return
+
+        self.blacklist = []
+        try:
+            # Parse markdown list items ("- entry" / "* entry") in one pass,
+            # line by line — no regex engine, no intermediate match list
+            with open(self.blacklist_path, "r", encoding="utf-8") as f:
+                for raw in f:
+                    line = raw.strip()
+                    # Marker must be followed by whitespace, so a bare
+                    # "*.example.com" line is not mistaken for a list item
+                    if len(line) < 2 or line[0] not in "-*" or not line[1].isspace():
+                        continue
+                    item = line[1:].strip()
+                    # Skip comments and empty items
+                    if item and not item.startswith("#") and not item.startswith("<!--"):
+                        self.blacklist.append(item.lower())
+
+        except Exception as e:
+            print(f"⚠️ Failed to load blacklist: {e}")
+
+        self._loaded_stat = (st.st_mtime_ns, st.st_size)
+        self._build_trie()
+
+    def _build_trie(self) -> None:
+        """Rebuild the reverse-label trie from DEFAULT_BLOCKED_TLDS + blacklist."""
+        self._trie = {}
+        self._version += 1
+        for tld in self.DEFAULT_BLOCKED_TLDS:
+            node = self._trie.setdefault(tld.lstrip("."), {})
+            node[None] = ("tld", tld)
+        for entry in self.blacklist:
+            self._insert_entry(entry)
+
+    def _insert_entry(self, entry: str) -> None:
+        """Insert one blacklist entry (exact or *.wildcard) into the trie."""
+        domain = entry[2:] if entry.startswith("*.") else entry
+        node = self._trie
+        for label in reversed(domain.split(".")):
+            node = node.setdefault(label, {})
+        node[None] = ("entry", entry)
+
+    def reload_blacklist(self) -> None:
+        """Reload blacklist from file."""
+        self._load_blacklist()
+
+    def is_allowed(self, target: ParsedTarget) -> Tuple[bool, str]:
+        """
+        Check if target is allowed (not in blacklist).
+        
+        Args:
+            target: ParsedTarget to validate
+            
+        Returns:
+            Tuple of (is_allowed: bool, reason: str)
+        """
+        if not target.is_valid:
+            return False, target.error or "Invalid target"
+
+        # Get the domain/IP to check
+        normalized = target.normalized
+        if isinstance(normalized, list):
+            # For lists, check all items
+            for item in normalized:
+                allowed, reason = self._check_single(item)
+                if not allowed:
+                    return False, reason
+            return True, "All targets allowed"
+        
+        return self._check_single(normalized)
+
+    def _check_single(self, value: str) -> Tuple[bool, str]:
+        """Check a single target value against the blacklist (cached)."""
+        return self._check_cached(value.lower(), self._version)
+
+    def _check_uncached(self, value: str, _version: int) -> Tuple[bool, str]:
+        """Walk the target's labels through the blacklist trie.
+
+        One dict probe per label, independent of how many entries the
+        blacklist holds. Called through the lru_cache wrapper; _version only
+        exists to key the cache per blacklist generation.
+        """
+        labels = value.split(".")
+        depth = len(labels)
+        node = self._trie
+        for label in reversed(labels):
+            node = node.get(label)
+            if node is None:
+                break
+            depth -= 1
+            term = node.get(None)
+            if term is None:
+                continue
+            kind, entry = term
+            if kind == "tld":
+                # TLDs block subdomains only (matches the old endswith check)
+                if depth:
+                    return False, f"Target '{value}' is in a restricted TLD ({entry})"
+            elif entry.startswith("*."):
+                return False, f"Target '{value}' matches blacklist pattern '{entry}'"
+            elif depth == 0:
+                return False, f"Target '{value}' is blacklisted"
+            else:
+                return False, f"Target '{value}' is a subdomain of blacklisted '{entry}'"
+
+        return True, "Target allowed"
+
+    def add_to_blacklist(self, target: str) -> bool:
+        """
+        Add a target to the blacklist file.
+        
+        Args:
+            target: Target to add
+            
+        Returns:
+            True if successful
+        """
+        target = target.strip().lower()
+        if target in self.blacklist:
+            return True  # Already exists
+
+        try:
+            # Ensure directory exists
+            os.makedirs(os.path.dirname(self.blacklist_path), exist_ok=True)
+            
+            # Append to file
+            with open(self.blacklist_path, "a", encoding="utf-8") as f:
+                f.write(f"\n- {target}")
+            
+            self.blacklist.append(target)
+            self._insert_entry(target)
+            self._version += 1
+            # Track the appended file so the next reload stays a no-op
+            try:
+                st = os.stat(self.blacklist_path)
+                self._loaded_stat = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                self._loaded_stat = None
+            return True
+        except Exception as e:
+            print(f"❌ Failed to add to blacklist: {e}")
+            return False
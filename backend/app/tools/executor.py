@@ -8,6 +8,7 @@ Metaphorically, this is the 'heart' of the pentest engine, combining:
 5. Execution history and session management
 """
 
+import collections
 import os
 import sys
 import time
@@ -20,9 +21,21 @@ import importlib
 import inspect
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, Any, Optional, List, Callable, Generator, Union
+from typing import Dict, Any, Optional, List, Callable, Generator, Tuple, Union
 
 from app.tools.specs import ToolSpec, CommandTemplate, get_all_specs
+from app.tools.output_parsers import get_parser
+
+
+# Implementation-path → (func, parameter-name frozenset). import_module +
+# getattr + inspect.signature run once per implementation, not per call —
+# signature() alone costs tens of µs, which dominates short tool calls.
+_IMPL_CACHE: Dict[str, Tuple[Callable, frozenset]] = {}
+
+# Parameter aliases tried when 'target' is absent, and URL scheme prefixes —
+# built once instead of per command build
+_TARGET_FALLBACKS = ('domain', 'url', 'host', 'ip', 'address')
+_HTTP_PREFIXES = ('http://', 'https://')
 
 
 @dataclass
@@ -46,7 +59,9 @@ class ToolExecutor:
     def __init__(self):
         self.specs: Dict[str, ToolSpec] = {}
         self.aliases: Dict[str, str] = {}
-        self.execution_history: List[Dict[str, Any]] = []
+        # Bounded: long-running agents would otherwise grow this without
+        # limit; deque(maxlen) evicts the oldest entry in O(1) on append
+        self.execution_history: collections.deque = collections.deque(maxlen=10000)
         self._load_specs()
         self._discover_tools()
         self.working_dir = tempfile.gettempdir()
@@ -101,38 +116,43 @@ class ToolExecutor:
             # Fallback to name if not found but marked as available (system path)
             args.append(spec.name)
             
-        # Normalize/Map parameters (support common aliases)
-        norm_params = dict(params)
-        
-        # Mapping logic (target -> domain/url/ip etc)
-        if 'target' not in norm_params:
-            for fallback in ['domain', 'url', 'host', 'ip', 'address']:
-                if fallback in norm_params:
-                    norm_params['target'] = norm_params[fallback]
-                    break
-        
-        # domain/url auto-completion
-        if 'domain' not in norm_params and 'target' in norm_params:
-            norm_params['domain'] = norm_params['target']
-            
-        if 'url' not in norm_params and 'target' in norm_params:
-            val = str(norm_params['target'])
-            if not val.startswith(('http://', 'https://')):
-                val = f"http://{val}"
-            norm_params['url'] = val
-
-        # Substitute template variables
-        for arg in template.args:
-            if "{" in arg and "}" in arg:
-                # Replace all {key} with value
-                for key, value in norm_params.items():
-                    arg = arg.replace(f"{{{key}}}", str(value))
-                
-                # Check for remaining required placeholders
-                if "{" in arg:
-                    raise KeyError(f"Missing required parameter in template: {arg}")
-            args.append(arg)
-            
+        # Normalize/Map parameters (support common aliases). When target,
+        # domain and url are all present nothing gets injected, so skip the
+        # per-call dict copy on that common path.
+        if 'target' in params and 'domain' in params and 'url' in params:
+            norm_params = params
+        else:
+            norm_params = dict(params)
+
+            # Mapping logic (target -> domain/url/ip etc)
+            if 'target' not in norm_params:
+                for fallback in _TARGET_FALLBACKS:
+                    if fallback in norm_params:
+                        norm_params['target'] = norm_params[fallback]
+                        break
+
+            # domain/url auto-completion
+            if 'domain' not in norm_params and 'target' in norm_params:
+                norm_params['domain'] = norm_params['target']
+
+            if 'url' not in norm_params and 'target' in norm_params:
+                val = str(norm_params['target'])
+                if not val.startswith(_HTTP_PREFIXES):
+                    val = f"http://{val}"
+                norm_params['url'] = val
+
+        # Fail fast on missing placeholders — one frozenset difference
+        # instead of catching a KeyError mid-render
+        missing = template.required_keys - norm_params.keys()
+        if missing:
+            raise KeyError(
+                f"Missing required parameter in template: {', '.join(sorted(missing))}"
+            )
+
+        # Substitute template variables via the precompiled arg plan —
+        # bare "{key}" args become one dict lookup, no format parser
+        args.extend(template.render(norm_params))
+
         return args
 
     def get_command_string(self, tool_name: str, command_name: str, params: Dict[str, Any]) -> str:
@@ -190,7 +210,6 @@ class ToolExecutor:
             
             # Auto-parse if success
             if success:
-                from app.tools.output_parsers import get_parser
                 parser = get_parser(tool_name)
                 result.parsed_data = parser(result.output)
 
@@ -253,7 +272,6 @@ class ToolExecutor:
             )
             
             # Parse result
-            from app.tools.output_parsers import get_parser
             parser = get_parser(tool_name)
             result.parsed_data = parser(output_str)
 
@@ -314,12 +332,16 @@ class ToolExecutor:
     def _run_implementation(self, spec: ToolSpec, params: Dict[str, Any], agent, session_id) -> ToolResult:
         """Runs a tool via its Python implementation path."""
         try:
-            mod_name, func_name = spec.implementation.rsplit('.', 1)
-            mod = importlib.import_module(mod_name)
-            func = getattr(mod, func_name)
-            
-            sig = inspect.signature(func)
-            valid_params = {k: v for k, v in params.items() if k in sig.parameters}
+            cached = _IMPL_CACHE.get(spec.implementation)
+            if cached is None:
+                mod_name, func_name = spec.implementation.rsplit('.', 1)
+                mod = importlib.import_module(mod_name)
+                func = getattr(mod, func_name)
+                cached = (func, frozenset(inspect.signature(func).parameters))
+                _IMPL_CACHE[spec.implementation] = cached
+            func, param_names = cached
+
+            valid_params = {k: params[k] for k in params.keys() & param_names}
             
             start_time = time.time()
             raw_res = func(**valid_params)
@@ -361,39 +383,52 @@ class ToolExecutor:
                 close_fds=True, preexec_fn=os.setsid
             )
             os.close(slave_fd)
-            
+            # Non-blocking so one select wakeup can drain the whole kernel
+            # buffer (64 KiB reads until EAGAIN) instead of 4 KiB per wakeup
+            os.set_blocking(master_fd, False)
+
             start_time = time.time()
-            buffer = []
-            
-            while True:
+            buf = bytearray()
+            eof = False
+
+            while not eof:
                 if time.time() - start_time > timeout:
                     process.terminate()
                     yield "[TIMEOUT]"
                     break
-                
+
                 r, _, _ = select.select([master_fd], [], [], 0.1)
                 if master_fd in r:
                     try:
-                        data = os.read(master_fd, 4096)
-                        if not data: break
-                        
-                        decoded = data.decode('utf-8', errors='replace')
-                        for char in decoded:
-                            if char in ('\r', '\n'):
-                                if buffer:
-                                    yield "".join(buffer)
-                                    buffer = []
-                            else:
-                                buffer.append(char)
+                        while True:
+                            try:
+                                data = os.read(master_fd, 65536)
+                            except BlockingIOError:
+                                break
+                            if not data:
+                                eof = True
+                                break
+                            buf += data
                     except OSError as e:
-                        if e.errno == errno.EIO: break # EOF on PTY
-                        raise e
+                        if e.errno == errno.EIO: eof = True # EOF on PTY
+                        else: raise e
+
+                    # Split off every complete line in one C-level pass
+                    # (splitlines handles \r, \n and \r\n) instead of
+                    # walking the chunk char by char.
+                    end = max(buf.rfind(b"\n"), buf.rfind(b"\r"))
+                    if end >= 0:
+                        complete = bytes(buf[:end + 1])
+                        del buf[:end + 1]
+                        for line in complete.splitlines():
+                            if line:
+                                yield line.decode('utf-8', errors='replace')
                 elif process.poll() is not None:
                     break
         finally:
             try: os.close(master_fd)
             except: pass
-            if buffer: yield "".join(buffer)
+            if buf: yield buf.decode('utf-8', errors='replace')
 
     def _record_history(self, result: ToolResult, params: Dict[str, Any], agent: str, session_id: str):
         """Append to in-memory history."""
@@ -420,12 +455,11 @@ class ToolExecutor:
         lines = [l.strip() for l in output.split("\n") if l.strip()]
         if len(lines) <= header_line: return []
         headers = lines[header_line].split()
-        rows = []
-        for line in lines[header_line+1:]:
-            vals = line.split()
-            if len(vals) >= len(headers):
-                rows.append({headers[i]: vals[i] for i in range(len(headers))})
-        return rows
+        # dict(zip(...)) builds each row in C; zip also truncates extra
+        # columns, so no per-cell index arithmetic in Python
+        n = len(headers)
+        split_rows = (line.split() for line in lines[header_line + 1:])
+        return [dict(zip(headers, vals)) for vals in split_rows if len(vals) >= n]
 
 
 # Global Singleton
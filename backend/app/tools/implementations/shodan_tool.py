@@ -3,15 +3,17 @@
 import os
 import json
 import shodan
+from itertools import islice
 from typing import Dict, Any, Optional
 
-def search(query: str, filters: Optional[Dict] = None) -> Dict[str, Any]:
+def search(query: str, filters: Optional[Dict] = None, limit: int = 100) -> Dict[str, Any]:
     """Search Shodan for internet-connected devices and services.
-    
+
     Args:
         query: Shodan search query
         filters: Additional search filters (optional)
-        
+        limit: Max matches to process (0 = no cap; each 100 costs a query credit)
+
     Returns:
         Dict with search results and metadata
     """
@@ -26,45 +28,54 @@ def search(query: str, filters: Optional[Dict] = None) -> Dict[str, Any]:
     try:
         api = shodan.Shodan(api_key)
         
-        # Build effective query
-        full_query = query
+        # Build effective query in one join instead of repeated concatenation
         if filters:
-            for key, value in filters.items():
-                if value:
-                    full_query += f" {key}:{value}"
+            parts = [query]
+            parts.extend(f"{key}:{value}" for key, value in filters.items() if value)
+            full_query = " ".join(parts)
+        else:
+            full_query = query
         
-        # Execute search
-        results = api.search(full_query)
-        
-        # Standardize results for Firestarter findings
-        ips = []
+        # Stream matches through the cursor API: pages arrive lazily and are
+        # parsed as they come (instead of one fully-buffered 100-result page),
+        # and limit can go past the first page when callers need more.
+        total = api.count(full_query).get('total', 0)
+        matches = api.search_cursor(full_query)
+        if limit:
+            matches = islice(matches, limit)
+
+
+        # Standardize results for Firestarter findings — sets dedup IPs and
+        # technologies as they arrive instead of a list(set(...)) pass at the end
+        ips = set()
         open_ports = []
         vulnerabilities = []
-        technologies = []
-        
-        for match in results.get('matches', []):
+        technologies = set()
+
+        for match in matches:
             ip = match.get('ip_str')
             if not ip:
                 continue
-                
-            ips.append(ip)
-            
+
+            ips.add(ip)
+
             # Port and Service info
             port = match.get('port')
             if port:
+                hostnames = match.get('hostnames')
                 open_ports.append({
                     "ip": ip,
                     "port": port,
                     "protocol": match.get('transport', 'tcp'),
                     "service": match.get('product', ''),
                     "version": match.get('version', ''),
-                    "host": match.get('hostnames', [ip])[0] if match.get('hostnames') else ip
+                    "host": hostnames[0] if hostnames else ip
                 })
-            
+
             # Extract technologies/products
             product = match.get('product')
             if product:
-                technologies.append(product)
+                technologies.add(product)
                 
             # Extract vulnerabilities (CVEs)
             vulns = match.get('vulns', [])
@@ -81,13 +92,13 @@ def search(query: str, filters: Optional[Dict] = None) -> Dict[str, Any]:
         return {
             "success": True,
             "results": {
-                "ips": list(set(ips)),
+                "ips": list(ips),
                 "open_ports": open_ports,
                 "vulnerabilities": vulnerabilities,
-                "technologies": list(set(technologies)),
-                "total": results.get('total', 0)
+                "technologies": list(technologies),
+                "total": total
             },
-            "output": f"Shodan found {results.get('total', 0)} results for query: {full_query}"
+            "output": f"Shodan found {total} results for query: {full_query}"
         }
         
     except shodan.APIError as e:
@@ -1,88 +1,178 @@
 """Output parsers for security tools."""
 
-from typing import Dict, Any, List, Optional
+from array import array
+from typing import Dict, Any, List, Optional, Tuple
+import functools
 import re
 
+# Compiled once at import: the parsers run per tool invocation (and some
+# patterns per line), so repeated re.compile / re._compile cache lookups
+# were pure overhead on these hot string-scanning paths.
+_ANSI_RE = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+_FQDN_RE = re.compile(
+    r'\b(?:[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?\.)+[a-z]{2,}\b',
+    re.IGNORECASE
+)
+# Matched with fullmatch(), which implies the anchors without the engine
+# having to evaluate them
+_IP_ONLY_RE = re.compile(r'[\d.]+')
+
+# Fused dig/dns scanner: IPs and dot-terminated names (dig +short NS/CNAME
+# style) collected in one walk over the output instead of an IP findall
+# plus a per-line endswith loop over the same bytes
+_DNS_COMBINED = re.compile(
+    r'(?P<ip>\b(?:\d{1,3}\.){3}\d{1,3}\b)'
+    r'|^[ \t]*(?P<fqdn>[A-Za-z0-9._-]+\.)[ \t]*$',
+    re.MULTILINE
+)
+_EMAIL_RE = re.compile(r'[\w\.-]+@[\w\.-]+\.\w+')
+
+# Subfinder noise filter: library-file suffixes and well-known non-target
+# hosts, split by match type so each check is one C-level call
+_BAD_SUFFIXES = ('.exe', '.so', '.dll', '.github.com', '.owasp.org')
+_BAD_HOSTS = frozenset({'github.com', 'owasp.org'})
+# Case-insensitive searches that early-exit in C — no stdout.lower() copy
+_HEARTBLEED_RE = re.compile(r'heartbleed', re.IGNORECASE)
+_VULN_RE = re.compile(r'vulnerable', re.IGNORECASE)
+_SUBJECT_RE = re.compile(r'Subject:\s*(.*)')
+_SERVER_RE = re.compile(r'Server:\s*(.*)')
+_STATUS_RE = re.compile(r'\[(\d{3})\]')
+_TITLE_RE = re.compile(r'\[(.*?)\]')
+
+# Fused nmap scanner: host headers and port lines in one MULTILINE
+# alternation, so multi-megabyte outputs are walked once by the regex engine
+# instead of line-split and probed by three separate patterns.
+_NMAP_COMBINED = re.compile(
+    r'Nmap scan report for (?P<host>[^\s(]+)(?:\s+\((?P<ip>[\d.]+)\))?'
+    r'|^(?P<port>\d+)/(?P<proto>tcp|udp)\s+(?P<state>open|closed|filtered)'
+    r'\s+(?P<svc>\S+)(?:[ \t]+(?P<banner>[^\r\n]*))?$',
+    re.MULTILINE
+)
+
+
+def ports_to_columns(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Transpose parse_nmap port records into a columnar layout.
+
+    For large scans, callers that filter or aggregate over one field
+    (ports below 1024, counts per service) can walk a flat column instead
+    of chasing a dict per record; port numbers pack into an array('H')
+    at two bytes each. The record list stays the wire format — every
+    existing consumer keeps its dicts — so this is strictly opt-in.
+    """
+    cols: Dict[str, Any] = {
+        "host": [], "ip": [], "port": array('H'), "protocol": [],
+        "state": [], "service": [], "version": [], "fingerprint": []
+    }
+    for rec in records:
+        for key, col in cols.items():
+            col.append(rec[key])
+    return cols
+
+
+def _collapse(hosts: set) -> set:
+    """Drop hosts whose parent domain is already in the set.
+
+    Subfinder/amass routinely emit a.b.target.com alongside b.target.com;
+    scanning both wastes every downstream stage (nmap, httpx). Walking each
+    host's ancestor suffixes against the set keeps only the widest names.
+
+    Opt-in for building scan-target lists only: if the apex itself is in
+    the set (amass prints it routinely) every subdomain collapses into it,
+    so this must never run on findings being stored.
+    """
+    covered = set()
+    for h in hosts:
+        p = h.partition('.')[2]
+        while p:
+            if p in hosts:
+                covered.add(h)
+                break
+            p = p.partition('.')[2]
+    return hosts - covered
+
+
 class ToolOutputParser:
     """Parser for tool execution output."""
     
     @staticmethod
     def strip_ansi(text: str) -> str:
         """Remove ANSI escape codes from text."""
-        ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-        return ansi_escape.sub('', text)
+        # Most tool output (-silent / +short modes) carries no escapes at
+        # all; one C-level substring scan skips the regex pass entirely
+        if '\x1b' not in text:
+            return text
+        return _ANSI_RE.sub('', text)
 
     @staticmethod
-    def parse_subfinder(stdout: str) -> Dict[str, Any]:
+    def parse_subfinder(stdout: str, collapse: bool = False) -> Dict[str, Any]:
         """Parse subfinder/amass output using robust FQDN regex."""
         stdout = ToolOutputParser.strip_ansi(stdout)
-        
-        fqdn_pattern = re.compile(
-            r'\b(?:[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?\.)+[a-z]{2,}\b',
-            re.IGNORECASE
-        )
-        
-        subdomains = []
-        for line in stdout.split('\n'):
-            line = line.strip()
-            if not line:
-                continue
-            
-            matches = fqdn_pattern.findall(line)
-            for m in matches:
-                m_lower = m.lower()
-                if 4 < len(m_lower) < 253:
-                    if not any(stop in m_lower for stop in [".exe", ".so", ".dll", "github.com", "owasp.org"]):
-                        subdomains.append(m_lower)
-                        
-        return {"subdomains": list(set(subdomains))}
+
+        # One findall over the whole output — the pattern can't cross line
+        # boundaries, so the per-line split/strip loop bought nothing
+        subdomains = set()
+        for m in _FQDN_RE.finditer(stdout):
+            m_lower = m.group().lower()
+            if 4 < len(m_lower) < 253:
+                if not (m_lower.endswith(_BAD_SUFFIXES) or m_lower in _BAD_HOSTS):
+                    subdomains.add(m_lower)
+
+        if collapse:
+            subdomains = _collapse(subdomains)
+
+        return {"subdomains": list(subdomains)}
 
     @staticmethod
-    def parse_nmap(stdout: str) -> Dict[str, Any]:
-        """Parse nmap output with service/version detection."""
-        open_ports = []
+    def parse_nmap_stream(lines) -> Any:
+        """Parse nmap output incrementally, yielding one dict per port line.
+
+        Parsing is strictly line-local (the only state is the current host
+        header), so feeding lines as they arrive — e.g. straight off the PTY
+        stream — keeps memory O(1) on masscan-sized outputs instead of
+        buffering the whole transcript first.
+        """
         current_host = None
         current_ip = None
-        
-        # Clean output of ANSI codes
-        stdout = ToolOutputParser.strip_ansi(stdout)
-        
-        lines = stdout.split('\n')
+
         for line in lines:
-            line = line.strip()
-            if "Nmap scan report for" in line:
-                parts = line.split()
-                ip_match = re.search(r'\(([\d\.]+)\)', line)
-                if ip_match:
-                    current_ip = ip_match.group(1)
-                    host_part = line.replace("Nmap scan report for ", "").split(" (")[0]
-                    current_host = host_part if host_part != current_ip else current_ip
-                else:
-                    last = parts[-1]
-                    if re.match(r'^[\d\.]+$', last):
-                        current_ip = last
-                        current_host = last
-            
-            port_match = re.match(r'^(\d+)/(tcp|udp)\s+(open|closed|filtered)\s+([^\s]+)(?:\s+(.*))?$', line)
-            if port_match and current_ip:
-                port = int(port_match.group(1))
-                protocol = port_match.group(2)
-                state = port_match.group(3)
-                service = port_match.group(4)
-                banner = port_match.group(5) or ""
-                
-                open_ports.append({
+            if '\x1b' in line:
+                line = _ANSI_RE.sub('', line)
+            m = _NMAP_COMBINED.search(line)
+            if m is None:
+                continue
+            if m['port'] is None:
+                # Host header: "Nmap scan report for host (ip)" or bare IP
+                ip = m['ip']
+                host = m['host']
+                if ip:
+                    current_ip = ip
+                    current_host = host if host != ip else ip
+                elif _IP_ONLY_RE.fullmatch(host):
+                    current_ip = host
+                    current_host = host
+            elif current_ip:
+                service = m['svc']
+                banner = (m['banner'] or "").strip()
+
+                yield {
                     "host": current_host,
                     "ip": current_ip,
-                    "port": port,
-                    "protocol": protocol,
-                    "state": state,
+                    "port": int(m['port']),
+                    "protocol": m['proto'],
+                    "state": m['state'],
                     "service": service,
-                    "version": banner.strip(),
+                    "version": banner,
                     "fingerprint": f"{service} {banner}".strip()
-                })
-        
-        return {"open_ports": open_ports}
+                }
+
+    @staticmethod
+    def parse_nmap(stdout: str) -> Dict[str, Any]:
+        """Parse nmap output with service/version detection."""
+        return {
+            "open_ports": list(
+                ToolOutputParser.parse_nmap_stream(stdout.splitlines())
+            )
+        }
 
     @staticmethod
     def parse_whois(stdout: str) -> Dict[str, Any]:
@@ -91,7 +181,8 @@ class ToolOutputParser:
         if "Malformed request" in stdout or "No match" in stdout or "No WHOIS" in stdout:
              return {"error": "WHOIS lookup failed or no data found", "raw": stdout}
              
-        emails = set(re.findall(r'[\w\.-]+@[\w\.-]+\.\w+', stdout))
+        # Cheap substring gate before the regex — most WHOIS output has no email
+        emails = set(_EMAIL_RE.findall(stdout)) if "@" in stdout else set()
         return {
             "emails": list(emails),
             "raw": stdout
@@ -101,12 +192,13 @@ class ToolOutputParser:
     def parse_ssl(stdout: str) -> Dict[str, Any]:
         """Parse sslscan/openssl output."""
         vulns = []
-        if "Heartbleed" in stdout and "vulnerable" in stdout.lower():
+        if _HEARTBLEED_RE.search(stdout) and _VULN_RE.search(stdout):
             vulns.append({"type": "ssl_vuln", "target": "SSL/TLS", "severity": "high", "details": {"name": "Heartbleed"}})
         
         cert_info = {}
         if "Subject:" in stdout:
-            cert_info["subject"] = re.search(r'Subject:\s*(.*)', stdout).group(1) if re.search(r'Subject:\s*(.*)', stdout) else ""
+            subject = _SUBJECT_RE.search(stdout)
+            cert_info["subject"] = subject.group(1) if subject else ""
             
         return {
             "vulnerabilities": vulns,
@@ -118,13 +210,15 @@ class ToolOutputParser:
         """Parse httpx/curl output."""
         technologies = []
         if "Server:" in stdout:
-            server = re.search(r'Server:\s*(.*)', stdout)
+            server = _SERVER_RE.search(stdout)
             if server:
                 technologies.append(server.group(1).strip())
-        
-        # Simple extraction of titles/status codes
-        status_code = re.search(r'\[(\d{3})\]', stdout)
-        title = re.search(r'\[(.*?)\]', stdout) # This might be fragile
+
+        # Simple extraction of titles/status codes ("[" gates both patterns)
+        status_code = title = None
+        if "[" in stdout:
+            status_code = _STATUS_RE.search(stdout)
+            title = _TITLE_RE.search(stdout) # This might be fragile
         
         return {
             "technologies": list(set(technologies)),
@@ -137,14 +231,16 @@ class ToolOutputParser:
     @staticmethod
     def parse_dns(stdout: str) -> Dict[str, Any]:
         """Parse dig/dns output."""
-        ips = set(re.findall(r'\b(?:\d{1,3}\.){3}\d{1,3}\b', stdout))
-        
+        ips = set()
         domains = set()
-        for line in stdout.split('\n'):
-            line = line.strip()
-            if line.endswith('.') and '.' in line[:-1]:
-                domains.add(line[:-1].lower())
-                
+        for m in _DNS_COMBINED.finditer(stdout):
+            if m.lastgroup == 'ip':
+                ips.add(m.group())
+            else:
+                name = m['fqdn'][:-1].lower()
+                if '.' in name:
+                    domains.add(name)
+
         return {
             "ips": list(ips),
             "subdomains": list(domains)
@@ -155,38 +251,51 @@ class ToolOutputParser:
         """Generic backup parser."""
         return {}
 
+# Ordered (keyword, parser) dispatch table, flattened from the old if/elif
+# chain with the same precedence: subdomain tools, then scanners (so
+# "masscan" hits parse_nmap before the bare "mass" amass alias), then the
+# protocol parsers. Tuple order is load-bearing.
+_PARSER_KEYWORDS = (
+    ("subfinder", ToolOutputParser.parse_subfinder),
+    ("assetfinder", ToolOutputParser.parse_subfinder),
+    ("amass", ToolOutputParser.parse_subfinder),
+    ("subdomain", ToolOutputParser.parse_subfinder),
+    ("finder", ToolOutputParser.parse_subfinder),
+    ("nmap", ToolOutputParser.parse_nmap),
+    ("masscan", ToolOutputParser.parse_nmap),
+    ("rustscan", ToolOutputParser.parse_nmap),
+    ("port_scan", ToolOutputParser.parse_nmap),
+    ("mass", ToolOutputParser.parse_subfinder),
+    ("whois", ToolOutputParser.parse_whois),
+    ("ssl", ToolOutputParser.parse_ssl),
+    ("tls", ToolOutputParser.parse_ssl),
+    ("cert", ToolOutputParser.parse_ssl),
+    ("http", ToolOutputParser.parse_http),
+    ("curl", ToolOutputParser.parse_http),
+    ("web", ToolOutputParser.parse_http),
+    ("header", ToolOutputParser.parse_http),
+    ("dig", ToolOutputParser.parse_dns),
+    ("dns", ToolOutputParser.parse_dns),
+    ("lookup", ToolOutputParser.parse_dns),
+)
+
+
+@functools.lru_cache(maxsize=256)
 def get_parser(tool_name: str):
     """Get parser function for tool."""
     tool_name = tool_name.lower()
-    
-    # Subdomain discovery tools
-    subdomain_kw = ["subfinder", "assetfinder", "amass", "subdomain", "finder"]
-    if any(kw in tool_name for kw in subdomain_kw):
-        return ToolOutputParser.parse_subfinder
-        
-    # Scanning tools
-    elif any(kw in tool_name for kw in ["nmap", "masscan", "rustscan", "port_scan"]):
-        return ToolOutputParser.parse_nmap
-        
-    # Amass alias "mass" (handles mass without matching masscan)
-    elif "mass" in tool_name:
-        return ToolOutputParser.parse_subfinder
-        
-        
-    # WHOIS
-    elif "whois" in tool_name:
-        return ToolOutputParser.parse_whois
-        
-    # SSL/TLS
-    elif any(alias in tool_name for alias in ["ssl", "tls", "cert"]):
-        return ToolOutputParser.parse_ssl
-        
-    # HTTP/Web
-    elif any(alias in tool_name for alias in ["http", "curl", "web", "header"]):
-        return ToolOutputParser.parse_http
-        
-    # DNS
-    elif any(alias in tool_name for alias in ["dig", "dns", "lookup"]):
-        return ToolOutputParser.parse_dns
-        
+    for kw, parser in _PARSER_KEYWORDS:
+        if kw in tool_name:
+            return parser
     return ToolOutputParser.parse_generic
+
+
+def parse_many(jobs: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+    """Parse a batch of (tool_name, stdout) pairs, in job order.
+
+    A plain loop on purpose: the parsers are pure-Python regex passes and
+    sre holds the GIL for the whole match, so threads would only
+    serialize with extra overhead. If batch parsing ever shows up in a
+    profile, a process pool is the escape hatch.
+    """
+    return [get_parser(tool)(stdout) for tool, stdout in jobs]
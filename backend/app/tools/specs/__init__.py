@@ -1,8 +1,12 @@
 """Tool Specs Package - Declarative tool specifications."""
 
-from typing import List, Optional
+import sys
+from string import Formatter
+from types import MappingProxyType
+from typing import Dict, List, Optional, Sequence, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache, partial
 
 
 class ToolCategory(str, Enum):
@@ -18,18 +22,128 @@ class ToolCategory(str, Enum):
     UTIL = "utility"
 
 
-@dataclass
+@lru_cache(maxsize=1)
+def _extra_search_paths() -> Tuple[str, ...]:
+    """Common non-standard executable locations (Go, local bin, snap)."""
+    import os
+    from pathlib import Path
+    home = str(Path.home())
+    return (
+        os.path.join(home, "go", "bin"),
+        os.path.join(home, ".local", "bin"),
+        "/usr/local/bin",
+        "/snap/bin",
+    )
+
+
+@lru_cache(maxsize=None)
+def _executable_index(extra: Tuple[str, ...]) -> dict:
+    """Index every executable reachable from PATH + extra dirs, once.
+
+    Dozens of specs each probe several candidate names; per-spec
+    shutil.which / isfile calls repeat the same directory stats over and
+    over. One scandir pass per directory turns discovery into dict probes.
+    First occurrence wins, preserving PATH precedence.
+    """
+    import os
+    index = {}
+    dirs = os.environ.get("PATH", os.defpath).split(os.pathsep) + list(extra)
+    for d in dirs:
+        try:
+            with os.scandir(d) as it:
+                for entry in it:
+                    if entry.name not in index:
+                        try:
+                            if entry.is_file() and os.access(entry.path, os.X_OK):
+                                index[entry.name] = entry.path
+                        except OSError:
+                            continue
+        except OSError:
+            continue
+    return index
+
+
+@lru_cache(maxsize=None)
+def _has_module(name: str) -> bool:
+    """Memoized importlib.util.find_spec probe (full sys.path scan per miss)."""
+    import importlib.util
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, AttributeError, ValueError):
+        return False
+
+
+# Shared storage for template args: tokens like "-T4", "-Pn" or "{target}"
+# recur across dozens of templates, so each is interned once and identical
+# arg sequences collapse onto a single shared tuple.
+_ARG_CACHE: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+
+def _intern_args(args: Sequence[str]) -> Tuple[str, ...]:
+    key = tuple(sys.intern(a) for a in args)
+    return _ARG_CACHE.setdefault(key, key)
+
+
+# slots=True drops the per-instance __dict__ (~300 bytes each) and makes
+# attribute access a C slot load; dozens of specs live for the process
+# lifetime, and workers that fork per request carry copies of all of them.
+@dataclass(slots=True)
 class CommandTemplate:
     """Template for a tool command."""
-    args: List[str]
+    args: Tuple[str, ...]  # normalized to an interned shared tuple in __post_init__
     timeout: int = 300
     requires_sudo: bool = False
     output_format: str = "text"
     success_codes: List[int] = field(default_factory=lambda: [0])
     description: str = ""
+    # Args precompiled at construction as (kind, payload): kind 0 is a
+    # literal emitted as-is, 1 a bare "{key}" arg resolved by one dict
+    # lookup, 2 a composite like "{url}/FUZZ" that still needs str.format.
+    # Most templated args are bare keys, so render() skips the format
+    # parser for them entirely.
+    _compiled: List[Tuple[int, str]] = field(
+        init=False, repr=False, compare=False
+    )
+    # Placeholder names this template needs, discovered once at
+    # construction so callers can fail fast before rendering
+    required_keys: frozenset = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.args = _intern_args(self.args)
+        compiled = []
+        keys = set()
+        for arg in self.args:
+            if "{" not in arg or "}" not in arg:
+                compiled.append((0, arg))
+            elif (arg[0] == "{" and arg[-1] == "}"
+                    and "{" not in arg[1:-1] and "}" not in arg[1:-1]):
+                compiled.append((1, arg[1:-1]))
+                keys.add(arg[1:-1])
+            else:
+                compiled.append((2, arg))
+                keys.update(
+                    name for _, name, _, _ in Formatter().parse(arg) if name
+                )
+        self._compiled = compiled
+        self.required_keys = frozenset(keys)
+
+    def render(self, ctx: dict) -> List[str]:
+        """Substitute ctx into the precompiled args.
 
+        Raises KeyError if a placeholder has no value in ctx.
+        """
+        out = []
+        for kind, arg in self._compiled:
+            if kind == 0:
+                out.append(arg)
+            elif kind == 1:
+                out.append(str(ctx[arg]))
+            else:
+                out.append(arg.format_map(ctx))
+        return out
 
-@dataclass
+
+@dataclass(slots=True)
 class ToolSpec:
     """Specification for a security tool.
     
@@ -47,57 +161,43 @@ class ToolSpec:
     implementation: Optional[str] = None
     rag_description: str = ""  # Enriched for Tool RAG
     when_to_use: List[str] = field(default_factory=list)  # Use cases for RAG matching
-    
+    # Frozen snapshot of commands.items(), so iteration doesn't rebuild a
+    # dict view per pass; commands itself is wrapped read-only below
+    _cmd_items: Tuple = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._cmd_items = tuple(self.commands.items())
+        self.commands = MappingProxyType(self.commands)
+
+
     def find_executable(self) -> bool:
         """Find the tool executable on the system with enhanced path discovery."""
-        import shutil
-        import os
-        from pathlib import Path
-        
         # 1. Check if it's an internal python implementation
         if self.implementation:
             self.is_available = True
             return True
-        
-        # 1. Check standard PATH
+
+        # 2. Look up candidates in the shared PATH + extra-dir index
+        index = _executable_index(_extra_search_paths())
         for exe_name in self.executable_names:
-            path = shutil.which(exe_name)
+            path = index.get(exe_name)
             if path:
                 self.executable_path = path
                 self.is_available = True
                 return True
-        
-        # 2. Check common non-standard locations (Go, Local Bin, etc.)
-        home = str(Path.home())
-        extra_paths = [
-            os.path.join(home, "go", "bin"),
-            os.path.join(home, ".local", "bin"),
-            "/usr/local/bin",
-            "/snap/bin"
-        ]
-        
-        for exe_name in self.executable_names:
-            for base_path in extra_paths:
-                full_path = os.path.join(base_path, exe_name)
-                # Check different extensions for Windows if needed, though they are likely in PATH already
-                if os.path.isfile(full_path) and os.access(full_path, os.X_OK):
-                    self.executable_path = full_path
-                    self.is_available = True
-                    return True
 
         # 3. Fallback: Check if it's a python package
         if "pip" in self.install_hint.lower() or "python" in self.install_hint.lower() or self.name.lower() in ["theharvester", "bbot"]:
             try:
-                import importlib.util
                 # Try name variants
                 for name in [self.name] + self.executable_names:
                     # heuristic: standard package names vs executable names
                     # e.g. "bbot" (pkg) vs "bbot" (exe), "theHarvester" (pkg) vs "theharvester" (exe)
                     clean_name = name.split()[0].split('-')[-1].replace('.', '_')
-                    if importlib.util.find_spec(clean_name) or importlib.util.find_spec(clean_name.lower()):
+                    if _has_module(clean_name) or _has_module(clean_name.lower()):
                         self.is_available = True
                         return True
-                        
+
                 # Additional check: try to import directly or check common names
                 import importlib
                 for name in ["theHarvester", "theharvester", "bbot"]:
@@ -110,22 +210,78 @@ class ToolSpec:
                              continue
             except (ImportError, AttributeError):
                 pass
-                
+
         return False
 
 
+# Per-category spec modules, imported one at a time on first use so a
+# caller that only needs one category never pays for the rest
+_SPEC_MODULES = ("recon", "scanning", "web", "vulnerability", "exploitation")
+
+
+@lru_cache(maxsize=None)
+def _load_module_specs(module_name: str) -> Tuple[ToolSpec, ...]:
+    """Import one spec module and instantiate its ToolSpecs, once.
+
+    Specs are declarative and the modules are side-effect free, so the
+    import and dataclass construction only need to happen on first use;
+    later callers (executor, tool RAG) share the same instances, including
+    any availability state find_executable has filled in.
+    """
+    import importlib
+    module = importlib.import_module(f"app.tools.specs.{module_name}")
+    return tuple(module.get_specs())
+
+
+# Public lazy-loader map: iterate only the categories you need
+SPEC_LOADERS = {name: partial(_load_module_specs, name) for name in _SPEC_MODULES}
+
+
+# Specs registered from outside the category modules (plugin-style)
+_EXTRA_SPECS: List[ToolSpec] = []
+
+
+def register_spec(spec_fn):
+    """Register an out-of-tree ToolSpec factory with the registry.
+
+    Decorator form: the factory runs once at registration and its spec
+    joins get_all_specs()/template_index() alongside the built-in
+    modules. Cached aggregates are invalidated so late registrations
+    (plugins imported after first use) still show up.
+    """
+    _EXTRA_SPECS.append(spec_fn())
+    _load_all_specs.cache_clear()
+    template_index.cache_clear()
+    return spec_fn
+
+
+@lru_cache(maxsize=1)
+def _load_all_specs() -> Tuple[ToolSpec, ...]:
+    """Load every spec module (each cached individually)."""
+    all_specs = []
+    for module_name in _SPEC_MODULES:
+        all_specs.extend(_load_module_specs(module_name))
+    all_specs.extend(_EXTRA_SPECS)
+    return tuple(all_specs)
+
+
 def get_all_specs() -> List[ToolSpec]:
     """Get all tool specifications from all spec modules."""
-    from app.tools.specs import recon, scanning, web, vulnerability, exploitation
-    
-    all_specs = []
-    all_specs.extend(recon.get_specs())
-    all_specs.extend(scanning.get_specs())
-    all_specs.extend(web.get_specs())
-    all_specs.extend(vulnerability.get_specs())
-    all_specs.extend(exploitation.get_specs())
-    
-    return all_specs
+    return list(_load_all_specs())
+
+
+@lru_cache(maxsize=1)
+def template_index() -> Dict[Tuple[str, str], CommandTemplate]:
+    """Flat (tool_name, command_name) -> CommandTemplate lookup, built once.
+
+    For callers that resolve templates outside the executor's registry —
+    one hash probe instead of walking specs and their command dicts.
+    """
+    return {
+        (spec.name, cmd_name): template
+        for spec in _load_all_specs()
+        for cmd_name, template in spec.commands.items()
+    }
 
 
 # Re-export executor for convenience
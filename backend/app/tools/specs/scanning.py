@@ -2,13 +2,17 @@
 
 Port scanning, service detection, network mapping.
 """
-from typing import List
+import functools
+from typing import Tuple
 from app.tools.specs import ToolSpec, ToolCategory, CommandTemplate
 
 
-def get_specs() -> List[ToolSpec]:
+# Specs are static declarations; build them once and hand the same tuple
+# to every caller instead of re-instantiating the dataclasses per call.
+@functools.lru_cache(maxsize=1)
+def get_specs() -> Tuple[ToolSpec, ...]:
     """Get scanning tool specifications."""
-    return [
+    return (
         # ─────────────────────────────────────────────────────────
         # NMAP - Port Scanner
         # ─────────────────────────────────────────────────────────
@@ -166,4 +170,4 @@ def get_specs() -> List[ToolSpec]:
                 ),
             }
         ),
-    ]
+    )
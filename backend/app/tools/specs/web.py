@@ -2,13 +2,21 @@
 
 Web scanning, directory bruteforce, technology profiling.
 """
-from typing import List
+import functools
+from typing import Tuple
 from app.tools.specs import ToolSpec, ToolCategory, CommandTemplate
 
+# Shared across the gobuster and ffuf templates below
+_COMMON_WORDLIST = "/usr/share/wordlists/dirb/common.txt"
+_WORDLIST_ARGS = ("-w", _COMMON_WORDLIST)
 
-def get_specs() -> List[ToolSpec]:
+
+# Specs are static declarations; build them once and hand the same tuple
+# to every caller instead of re-instantiating the dataclasses per call.
+@functools.lru_cache(maxsize=1)
+def get_specs() -> Tuple[ToolSpec, ...]:
     """Get web application tool specifications."""
-    return [
+    return (
         # ─────────────────────────────────────────────────────────
         # GOBUSTER - Directory Bruteforce
         # ─────────────────────────────────────────────────────────
@@ -27,12 +35,12 @@ def get_specs() -> List[ToolSpec]:
             ],
             commands={
                 "dir": CommandTemplate(
-                    args=["dir", "-u", "{url}", "-w", "/usr/share/wordlists/dirb/common.txt", "-q"],
+                    args=["dir", "-u", "{url}", *_WORDLIST_ARGS, "-q"],
                     timeout=600,
                     description="Standard directory bruteforce"
                 ),
                 "vhost": CommandTemplate(
-                    args=["vhost", "-u", "{url}", "-w", "/usr/share/wordlists/dirb/common.txt", "-q"],
+                    args=["vhost", "-u", "{url}", *_WORDLIST_ARGS, "-q"],
                     timeout=600,
                     description="Virtual host discovery"
                 ),
@@ -57,12 +65,12 @@ def get_specs() -> List[ToolSpec]:
             ],
             commands={
                 "dir": CommandTemplate(
-                    args=["-u", "{url}/FUZZ", "-w", "/usr/share/wordlists/dirb/common.txt", "-s"],
+                    args=["-u", "{url}/FUZZ", *_WORDLIST_ARGS, "-s"],
                     timeout=600,
                     description="Directory fuzzing"
                 ),
                 "param": CommandTemplate(
-                    args=["-u", "{url}?FUZZ=test", "-w", "/usr/share/wordlists/dirb/common.txt", "-s"],
+                    args=["-u", "{url}?FUZZ=test", *_WORDLIST_ARGS, "-s"],
                     timeout=300,
                     description="Parameter fuzzing"
                 ),
@@ -142,4 +150,4 @@ def get_specs() -> List[ToolSpec]:
                 ),
             }
         ),
-    ]
+    )
@@ -1,14 +1,33 @@
-"""Tool Knowledge Schema - Pydantic models for RAG-based tool selection.
+"""Tool Knowledge Schema - Structured knowledge for RAG-based tool selection.
 
 Defines structured knowledge about tools that can be embedded and retrieved
-via semantic search.
+via semantic search. These are plain slotted dataclasses rather than pydantic
+models: every instance is built in-process from trusted sources (tools.json,
+the spec registry, rows we already validated), so the per-field validator
+chain bought nothing while construction runs hundreds of times per index
+rebuild. slots=True also drops the per-instance __dict__.
 """
 
-from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field
+from dataclasses import dataclass, field
+from functools import lru_cache
+from string import Formatter
+from typing import List, Optional, Dict, Any, Sequence, Tuple
 from enum import Enum
 
 
+@lru_cache(maxsize=256)
+def _compile_template(tpl: str) -> Tuple[Tuple[str, Optional[str]], ...]:
+    """Split a format template into (literal, key) segments, once per template.
+
+    Rendering then joins literals and dict lookups directly instead of
+    re-running str.format's brace parser on every execution.
+    """
+    return tuple(
+        (literal, key)
+        for literal, key, _spec, _conv in Formatter().parse(tpl)
+    )
+
+
 class RiskLevel(str, Enum):
     """Risk level classification for tools."""
     LOW = "low"
@@ -17,108 +36,125 @@ class RiskLevel(str, Enum):
     CRITICAL = "critical"
 
 
-class ToolCommand(BaseModel):
+@dataclass(slots=True)
+class ToolCommand:
     """A specific command within a tool."""
-    name: str = Field(..., description="Command name (e.g., 'quick', 'full', 'enum')")
-    purpose: str = Field(..., description="What this command does")
-    template: str = Field(..., description="Command template with placeholders (e.g., 'nmap -sV {target}')")
-    timeout: int = Field(default=300, description="Timeout in seconds")
-    requires_sudo: bool = Field(default=False)
-    risk_level: Optional[RiskLevel] = Field(default=None, description="Override tool-level risk")
-    
+    name: str                    # Command name (e.g., 'quick', 'full', 'enum')
+    purpose: str                 # What this command does
+    template: str                # Template with placeholders ('nmap -sV {target}')
+    timeout: int = 300           # Timeout in seconds
+    requires_sudo: bool = False
+    risk_level: Optional[RiskLevel] = None  # Override tool-level risk
+
     def get_embedding_text(self) -> str:
         """Generate text for embedding this command."""
         return f"{self.name}: {self.purpose}"
 
 
-class ToolKnowledge(BaseModel):
+@dataclass(slots=True)
+class ToolKnowledge:
     """Complete knowledge about a security tool for RAG retrieval."""
-    
+
     # Identity
-    tool: str = Field(..., description="Tool name (e.g., 'nmap', 'subfinder')")
-    aliases: List[str] = Field(default_factory=list, description="Alternative names")
-    
+    tool: str                                       # Tool name (e.g., 'nmap')
+    description: str                                # Human-readable description for embedding
+    # Sequence fields default to the shared empty tuple — no fresh list
+    # allocated per instance for fields that are only ever iterated
+    aliases: Sequence[str] = ()
+
     # Categorization
-    categories: List[str] = Field(default_factory=list, description="Categories (e.g., ['RECON_PORT', 'SERVICE_ENUM'])")
-    capabilities: List[str] = Field(default_factory=list, description="What the tool can do")
-    
+    categories: Sequence[str] = ()
+    capabilities: Sequence[str] = ()
+
     # RAG-specific fields
-    description: str = Field(..., description="Human-readable description for embedding")
-    when_to_use: List[str] = Field(default_factory=list, description="Use case descriptions for semantic matching")
-    
+    when_to_use: Sequence[str] = ()
+
     # Technical details
-    inputs: List[str] = Field(default_factory=list, description="Input types: ip, domain, url, cidr")
-    commands: List[ToolCommand] = Field(default_factory=list)
-    implementation: Optional[str] = Field(default=None, description="Python implementation path")
-    
+    inputs: Sequence[str] = ()  # ip, domain, url, cidr
+    commands: Sequence[ToolCommand] = ()
+    implementation: Optional[str] = None             # Python implementation path
+
     # Risk assessment
-    risk_level: RiskLevel = Field(default=RiskLevel.LOW)
-    requires_confirmation: bool = Field(default=False, description="Always needs HITL confirmation")
-    
+    risk_level: RiskLevel = RiskLevel.LOW
+    requires_confirmation: bool = False              # Always needs HITL confirmation
+
     # Metadata
     install_hint: Optional[str] = None
-    is_available: bool = Field(default=False, description="Tool is installed on system")
-    
-    def get_embedding_text(self) -> str:
-        """Generate comprehensive text for embedding this tool."""
-        parts = [
+    is_available: bool = False                       # Tool is installed on system
+
+    # Embedding texts derive purely from construction-time fields and are
+    # requested once per tool per index rebuild; format them a single time.
+    # (cached_property needs __dict__, which slots=True removes.)
+    _embedding_text: str = field(init=False, repr=False, compare=False)
+    _cmd_texts: List[Dict[str, str]] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # One flat tuple, one join: empty sections drop out via filter(None)
+        # instead of a branch-and-append loop building intermediate lists
+        self._embedding_text = "\n".join(filter(None, (
             f"Tool: {self.tool}",
             f"Description: {self.description}",
-        ]
-        
-        if self.capabilities:
-            parts.append(f"Capabilities: {', '.join(self.capabilities)}")
-        
-        if self.when_to_use:
-            parts.append(f"Use when: {'. '.join(self.when_to_use)}")
-        
-        if self.inputs:
-            parts.append(f"Inputs: {', '.join(self.inputs)}")
-            
-        # Include command purposes
-        for cmd in self.commands:
-            parts.append(f"Command {cmd.name}: {cmd.purpose}")
-        
-        return "\n".join(parts)
-    
-    def get_command_embedding_texts(self) -> List[Dict[str, str]]:
-        """Generate embedding texts for each command separately."""
-        texts = []
-        for cmd in self.commands:
-            text = f"Tool: {self.tool}\nCommand: {cmd.name}\nPurpose: {cmd.purpose}"
-            texts.append({
+            f"Capabilities: {', '.join(self.capabilities)}" if self.capabilities else "",
+            f"Use when: {'. '.join(self.when_to_use)}" if self.when_to_use else "",
+            f"Inputs: {', '.join(self.inputs)}" if self.inputs else "",
+            *(f"Command {cmd.name}: {cmd.purpose}" for cmd in self.commands),
+        )))
+        self._cmd_texts = [
+            {
                 "tool": self.tool,
                 "command": cmd.name,
-                "text": text
-            })
-        return texts
+                "text": f"Tool: {self.tool}\nCommand: {cmd.name}\nPurpose: {cmd.purpose}"
+            }
+            for cmd in self.commands
+        ]
+
+    def get_embedding_text(self) -> str:
+        """Comprehensive text for embedding this tool (precomputed)."""
+        return self._embedding_text
 
+    @classmethod
+    def batch_embedding_texts(cls, tools) -> List[str]:
+        """Embedding texts for a whole tool collection, ready for one
+        batched embed call instead of a per-tool round-trip."""
+        return [t.get_embedding_text() for t in tools]
 
-class ToolCandidate(BaseModel):
+    def get_command_embedding_texts(self) -> List[Dict[str, str]]:
+        """Embedding texts for each command separately (precomputed)."""
+        return self._cmd_texts
+
+
+@dataclass(slots=True)
+class ToolCandidate:
     """A tool retrieved from semantic search."""
     tool: str
-    command: Optional[str] = None
-    similarity: float = Field(..., ge=0, le=1)
+    similarity: float
     description: str
     risk_level: RiskLevel
+    command: Optional[str] = None
     template: Optional[str] = None
 
 
-class ToolSelection(BaseModel):
+@dataclass(slots=True)
+class ToolSelection:
     """LLM's selected tool and command."""
     tool: str
+    reasoning: str               # Why this tool was selected
     command: Optional[str] = None
-    parameters: Dict[str, Any] = Field(default_factory=dict)
-    reasoning: str = Field(..., description="Why this tool was selected")
-    confidence: float = Field(default=0.8, ge=0, le=1)
+    parameters: Dict[str, Any] = field(default_factory=dict)
+    confidence: float = 0.8
     risk_level: RiskLevel = RiskLevel.LOW
-    
+    # Template carried over from the selected candidate (set by the RAG)
+    _template: Optional[str] = field(default=None, repr=False, compare=False)
+
     def get_command_string(self, target: str) -> str:
         """Build the actual command string."""
-        params = {**self.parameters, "target": target, "domain": target, "url": target}
-        if hasattr(self, '_template') and self._template:
+        if self._template:
+            params = {**self.parameters, "target": target, "domain": target, "url": target}
             try:
-                return self._template.format(**params)
+                return "".join(
+                    literal + (str(params[key]) if key is not None else "")
+                    for literal, key in _compile_template(self._template)
+                )
             except KeyError:
                 pass
         return f"{self.tool} {target}"
@@ -5,12 +5,19 @@ Replaces hard-coded CATEGORY_TO_TOOL mapping with:
 2. LLM reasoning to select best tool+command
 """
 
+import asyncio
+import hashlib
+import math
+import os
 import uuid
-import json
+import re
+from collections import OrderedDict
 from typing import List, Optional, Dict, Any
 from pathlib import Path
 
-from sqlalchemy import select, text
+import orjson
+from pgvector.sqlalchemy import HALFVEC
+from sqlalchemy import Integer, bindparam, delete, insert, or_, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import async_session, ToolEmbedding
@@ -18,6 +25,92 @@ from app.tools.tool_knowledge import (
     ToolKnowledge, ToolCommand, ToolCandidate, ToolSelection, RiskLevel
 )
 
+# Singleton lookups for risk strings: built once instead of re-listing the
+# enum values per tool/candidate row; .get replaces the membership check +
+# enum construction with one hash probe
+_RISK_LOOKUP = {r.value: r for r in RiskLevel}
+_CONFIRM_RISKS = frozenset((RiskLevel.HIGH.value, RiskLevel.CRITICAL.value))
+
+# In-flight embedding request cap for the per-text fallback path; matches
+# the Ollama server's OLLAMA_NUM_PARALLEL so we saturate without queueing
+_EMBED_PARALLEL = int(os.getenv("OLLAMA_NUM_PARALLEL", "8"))
+
+# Entry cap for the query-embedding LRU in ToolRAG
+_QUERY_CACHE_SIZE = 1024
+
+# Resolved once; load_tools_from_json is on the startup hot path
+_TOOLS_JSON_PATH = Path(__file__).parent / "metadata" / "tools.json"
+
+# First {...} block in an LLM reply; select_tool runs per agent step, so
+# compiled once here rather than through re's per-call cache lookup
+_JSON_OBJ_RE = re.compile(r'\{.*\}', re.DOTALL)
+
+# Precompiled tool-search statement, same pattern as the memory manager's
+# semantic search: binding the vector with its pgvector type instead of
+# stringifying + ::halfvec-casting in SQL drops the manual str() and lets
+# asyncpg cache one prepared statement. DISTINCT ON keeps each tool's
+# best-ranked row server-side so exactly k distinct tools come back.
+_TOOL_SEARCH_STMT = text("""
+    WITH best AS (
+        SELECT DISTINCT ON (tool_name)
+               tool_name, command_name, description, risk_level,
+               -(vector <#> :query_vector) as similarity
+        FROM tool_embeddings
+        ORDER BY tool_name, vector <#> :query_vector
+    )
+    SELECT * FROM best
+    ORDER BY similarity DESC
+    LIMIT :k
+""").bindparams(
+    bindparam("query_vector", type_=HALFVEC(768)),
+    bindparam("k", type_=Integer())
+)
+
+def configure_hnsw_params(vector_count: int) -> tuple:
+    """Return (m, ef_construction, ef_search) tiered by catalog size.
+
+    Defaults (16/64/40) are optimal below 100K vectors; larger catalogs
+    trade build time and memory for recall. HNSW_M, HNSW_EF_CONSTRUCTION
+    and HNSW_EF_SEARCH env vars override any tier for ops tuning without
+    a redeploy.
+    """
+    if vector_count < 100_000:
+        m, ef_construction, ef_search = 16, 64, 40
+    elif vector_count < 1_000_000:
+        m, ef_construction, ef_search = 24, 100, 100
+    else:
+        m, ef_construction, ef_search = 32, 128, 200
+    return (
+        int(os.getenv("HNSW_M", m)),
+        int(os.getenv("HNSW_EF_CONSTRUCTION", ef_construction)),
+        int(os.getenv("HNSW_EF_SEARCH", ef_search)),
+    )
+
+
+# Salted into _text_hash so a change in how vectors are stored (e.g. the
+# switch to unit-length + inner product) invalidates every delta-indexed
+# row instead of leaving stale-format vectors behind
+_VECTOR_FORMAT = "unit-ip-1"
+
+
+def _text_hash(embed_text: str) -> str:
+    """Stable 160-bit BLAKE2 key for an embedded text."""
+    payload = f"{_VECTOR_FORMAT}\x00{embed_text}".encode("utf-8")
+    return hashlib.blake2b(payload, digest_size=20).hexdigest()
+
+
+def _normalize(vec: List[float]) -> List[float]:
+    """Scale a vector to unit length.
+
+    With unit inputs, inner product equals cosine similarity, so the
+    distance kernel skips the per-comparison norm/sqrt/divide.
+    """
+    norm = math.sqrt(sum(x * x for x in vec))
+    if not norm:
+        return vec
+    inv = 1.0 / norm
+    return [x * inv for x in vec]
+
 
 class ToolRAG:
     """Semantic tool retrieval and selection."""
@@ -26,33 +119,129 @@ class ToolRAG:
         self.embedding_dim = embedding_dim
         self._tools_cache: Dict[str, ToolKnowledge] = {}
         self._ollama_base_url = "http://localhost:11434"
-        
-    async def _get_embedding(self, text: str) -> List[float]:
-        """Get embedding vector from Ollama."""
+        # Lazily created so the client binds to the running event loop
+        self._client = None
+        # Query-time HNSW beam width; retiered by _ensure_index on re-index
+        self._ef_search = configure_hnsw_params(0)[2]
+        # LRU of normalized query text -> vector: recurring intents
+        # ("scan ports", "find subdomains") skip the ~30-200 ms Ollama
+        # round-trip entirely on repeat
+        self._query_cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        # Parsed catalog memo: (tools.json mtime, ToolKnowledge list).
+        # Instances are shared, matching how spec loading already works.
+        self._loaded_tools: Optional[tuple] = None
+
+    def _get_client(self):
+        """Return the shared AsyncClient, creating it on first use.
+
+        One long-lived client keeps connections to Ollama alive instead of
+        paying TCP handshake + pool teardown per embedding/selection call.
+        """
         import httpx
-        
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                f"{self._ollama_base_url}/api/embeddings",
-                json={
-                    "model": "nomic-embed-text",
-                    "prompt": text
-                }
+
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self._ollama_base_url,
+                http2=True,
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=16)
             )
-            response.raise_for_status()
-            data = response.json()
-            return data.get("embedding", [])
-    
+        return self._client
+
+    async def aclose(self):
+        """Close the shared client (wired to app shutdown)."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+
+    async def _get_embedding(self, text: str) -> List[float]:
+        """Get embedding vector from Ollama."""
+        response = await self._get_client().post(
+            "/api/embeddings",
+            json={
+                "model": "nomic-embed-text",
+                "prompt": text
+            },
+            timeout=30.0
+        )
+        response.raise_for_status()
+        data = response.json()
+        return _normalize(data.get("embedding", []))
+
+    async def _get_embeddings_batch(self, texts: List[str]) -> Optional[List[List[float]]]:
+        """Embed a whole batch in one /api/embed request (newer Ollama).
+
+        Returns None when the endpoint is unavailable or the response
+        doesn't line up, so the caller can fall back to per-text calls.
+        """
+        response = await self._get_client().post(
+            "/api/embed",
+            json={"model": "nomic-embed-text", "input": texts},
+            timeout=120.0
+        )
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        embeddings = response.json().get("embeddings")
+        if embeddings is None or len(embeddings) != len(texts):
+            return None
+        # N x 768 floats of math is enough to notice on the event loop
+        # during a full re-index; normalize the batch in a worker thread
+        return await asyncio.to_thread(
+            lambda: [_normalize(v) for v in embeddings]
+        )
+
+    async def _embed_texts(self, texts: List[str], max_concurrency: int = _EMBED_PARALLEL) -> List[List[float]]:
+        """Embed many texts, preserving order.
+
+        One batched /api/embed round-trip where the server supports it —
+        N network round-trips collapse into one — otherwise bounded
+        concurrent /api/embeddings calls. Failures come back as empty
+        vectors so one bad call doesn't sink the whole batch.
+        """
+        if not texts:
+            return []
+
+        try:
+            batch = await self._get_embeddings_batch(texts)
+            if batch is not None:
+                return batch
+        except Exception as e:
+            print(f"⚠️ Batch embedding failed, falling back to per-text calls: {e}")
+
+        sem = asyncio.Semaphore(max_concurrency)
+
+        async def _one(t: str) -> List[float]:
+            async with sem:
+                try:
+                    return await self._get_embedding(t)
+                except Exception as e:
+                    print(f"❌ Embedding error: {e}")
+                    return []
+
+        return await asyncio.gather(*(_one(t) for t in texts))
+
     async def load_tools_from_json(self) -> List[ToolKnowledge]:
-        """Load tools from tools.json and specs, convert to ToolKnowledge."""
-        tools_path = Path(__file__).parent / "metadata" / "tools.json"
-        
+        """Load tools from tools.json and specs, convert to ToolKnowledge.
+
+        The built list is memoized against tools.json's mtime, so repeat
+        callers (index_tools, availability refreshes) pay one stat() per
+        call instead of a reparse; editing the file invalidates naturally.
+        """
+        try:
+            mtime = _TOOLS_JSON_PATH.stat().st_mtime
+        except OSError:
+            mtime = None
+
+        if self._loaded_tools is not None and self._loaded_tools[0] == mtime:
+            return self._loaded_tools[1]
+
         tools = []
-        
-        if tools_path.exists():
-            with open(tools_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
+
+        if mtime is not None:
+            # orjson parses the whole catalog faster than stdlib json can
+            # stream it at this size; bytes in, no codec layer
+            data = orjson.loads(_TOOLS_JSON_PATH.read_bytes())
+
+
             for tool_data in data.get("tools", []):
                 # Build RAG description from existing fields
                 name = tool_data.get("name", "")
@@ -76,7 +265,7 @@ class ToolRAG:
                 
                 # Determine risk level
                 risk_str = tool_data.get("risk_level", "low")
-                risk_level = RiskLevel(risk_str) if risk_str in [r.value for r in RiskLevel] else RiskLevel.LOW
+                risk_level = _RISK_LOOKUP.get(risk_str, RiskLevel.LOW)
                 
                 tk = ToolKnowledge(
                     tool=name,
@@ -89,7 +278,7 @@ class ToolRAG:
                     commands=commands,
                     implementation=tool_data.get("implementation"),
                     risk_level=risk_level,
-                    requires_confirmation=tool_data.get("risk_level", "low") in ["high", "critical"]
+                    requires_confirmation=risk_str in _CONFIRM_RISKS
                 )
                 tools.append(tk)
                 self._tools_cache[name] = tk
@@ -100,11 +289,11 @@ class ToolRAG:
             for spec in get_all_specs():
                 if spec.name not in self._tools_cache:
                     commands = []
-                    for cmd_name, cmd_template in spec.commands.items():
+                    for cmd_name, cmd_template in spec._cmd_items:
                         commands.append(ToolCommand(
                             name=cmd_name,
                             purpose=cmd_template.description or f"{cmd_name} operation",
-                            template=" ".join([spec.name] + cmd_template.args),
+                            template=" ".join([spec.name, *cmd_template.args]),
                             timeout=cmd_template.timeout,
                             requires_sudo=cmd_template.requires_sudo
                         ))
@@ -114,8 +303,10 @@ class ToolRAG:
                         aliases=spec.aliases,
                         categories=[spec.category.value],
                         capabilities=[],
-                        description=spec.description,
-                        when_to_use=[],
+                        # Prefer the RAG-enriched text where a spec provides
+                        # one; the terse description is the fallback
+                        description=spec.rag_description or spec.description,
+                        when_to_use=spec.when_to_use,
                         inputs=["ip", "domain", "url"],
                         commands=commands,
                         implementation=spec.implementation,
@@ -126,100 +317,164 @@ class ToolRAG:
                     self._tools_cache[spec.name] = tk
         except ImportError:
             pass
-        
+
+        self._loaded_tools = (mtime, tools)
         return tools
     
     async def index_tools(self) -> int:
-        """Index all tools into pgvector. Returns count of indexed tools."""
+        """Index all tools into pgvector. Returns count of indexed tools.
+
+        Incremental: rows are keyed by a hash of their embedded text, so a
+        re-index only embeds texts that actually changed and only deletes
+        rows that no longer exist — an unchanged catalog costs zero Ollama
+        calls instead of a full re-embed.
+        """
         tools = await self.load_tools_from_json()
-        indexed = 0
-        
+
+        # Describe every desired row: (tool, command_name, text, hash)
+        entries = []
+        for tool in tools:
+            embed_text = tool.get_embedding_text()
+            entries.append((tool, None, embed_text, _text_hash(embed_text)))
+            for cmd_text in tool.get_command_embedding_texts():
+                entries.append(
+                    (tool, cmd_text["command"], cmd_text["text"], _text_hash(cmd_text["text"]))
+                )
+        desired_hashes = {e[3] for e in entries}
+
         async with async_session() as session:
-            # Clear existing tool embeddings
-            await session.execute(text("DELETE FROM tool_embeddings"))
-            
-            for tool in tools:
-                # Create tool-level embedding
-                embed_text = tool.get_embedding_text()
-                try:
-                    vector = await self._get_embedding(embed_text)
-                    if not vector or len(vector) != self.embedding_dim:
-                        print(f"⚠️ Skipping {tool.tool}: invalid embedding dimension")
-                        continue
-                    
-                    embedding = ToolEmbedding(
-                        id=str(uuid.uuid4()),
-                        tool_name=tool.tool,
-                        command_name=None,  # Tool-level
-                        description=embed_text,
-                        vector=vector,
-                        risk_level=tool.risk_level.value,
-                        extra_metadata={
-                            "capabilities": tool.capabilities,
-                            "aliases": tool.aliases
-                        }
+            result = await session.execute(select(ToolEmbedding.text_hash))
+            existing = {h for (h,) in result if h}
+
+        # Embed only the delta, each distinct text once: identical
+        # tool/command texts (common for single-command tools) share one
+        # Ollama call and one vector, reassigned afterwards by hash
+        new_entries = [e for e in entries if e[3] not in existing]
+        unique_index: Dict[str, int] = {}
+        unique_texts = []
+        for _, _, embed_text, h in new_entries:
+            if h not in unique_index:
+                unique_index[h] = len(unique_texts)
+                unique_texts.append(embed_text)
+        vectors = await self._embed_texts(unique_texts)
+
+        rows = []
+        for tool, command_name, embed_text, h in new_entries:
+            vector = vectors[unique_index[h]]
+            if not vector or len(vector) != self.embedding_dim:
+                print(f"⚠️ Skipping {tool.tool}/{command_name or '-'}: invalid embedding dimension")
+                continue
+            rows.append(dict(
+                id=str(uuid.uuid4()),
+                tool_name=tool.tool,
+                command_name=command_name,  # NULL = tool-level
+                description=embed_text,
+                text_hash=h,
+                vector=vector,
+                risk_level=tool.risk_level.value,
+                extra_metadata={
+                    "capabilities": list(tool.capabilities),
+                    "aliases": list(tool.aliases)
+                } if command_name is None else {}
+            ))
+
+        async with async_session() as session:
+            # Drop rows whose text vanished (plus legacy rows without a
+            # hash, which predate delta indexing) and add the new ones
+            await session.execute(
+                delete(ToolEmbedding).where(
+                    or_(
+                        ToolEmbedding.text_hash.is_(None),
+                        ToolEmbedding.text_hash.notin_(desired_hashes)
                     )
-                    session.add(embedding)
-                    indexed += 1
-                    
-                    # Also index individual commands
-                    for cmd_text in tool.get_command_embedding_texts():
-                        cmd_vector = await self._get_embedding(cmd_text["text"])
-                        if cmd_vector and len(cmd_vector) == self.embedding_dim:
-                            cmd_embedding = ToolEmbedding(
-                                id=str(uuid.uuid4()),
-                                tool_name=tool.tool,
-                                command_name=cmd_text["command"],
-                                description=cmd_text["text"],
-                                vector=cmd_vector,
-                                risk_level=tool.risk_level.value,
-                                extra_metadata={}
-                            )
-                            session.add(cmd_embedding)
-                            indexed += 1
-                            
-                except Exception as e:
-                    print(f"❌ Error indexing {tool.tool}: {e}")
-                    continue
-            
+                )
+            )
+            if rows:
+                # executemany-style bulk insert: one pipelined batch on the
+                # wire, no per-row unit-of-work bookkeeping
+                await session.execute(insert(ToolEmbedding), rows)
+            await session.commit()
+
+        await self._ensure_index()
+
+        unchanged = len(existing & desired_hashes)
+        print(f"✅ Indexed {len(rows)} tool embeddings ({unchanged} unchanged)")
+        return len(rows) + unchanged
+
+    async def _ensure_index(self) -> None:
+        """Retier the HNSW index if the catalog outgrew its build params.
+
+        The params a live index was built with are read back from
+        pg_class.reloptions, so a rebuild (expensive at scale) only
+        happens when configure_hnsw_params picks a different tier. Also
+        refreshes the query-time ef_search used by search().
+        """
+        async with async_session() as session:
+            count = (await session.execute(
+                text("SELECT COUNT(*) FROM tool_embeddings")
+            )).scalar() or 0
+            m, ef_construction, self._ef_search = configure_hnsw_params(count)
+
+            result = await session.execute(text(
+                "SELECT reloptions FROM pg_class"
+                " WHERE relname = 'tool_embeddings_vec_hnsw'"
+            ))
+            row = result.first()
+            current = set(row[0] or ()) if row else None
+            if current == {f"m={m}", f"ef_construction={ef_construction}"}:
+                return
+
+            await session.execute(text(
+                "DROP INDEX IF EXISTS tool_embeddings_vec_hnsw"
+            ))
+            await session.execute(text(
+                "CREATE INDEX tool_embeddings_vec_hnsw ON tool_embeddings"
+                " USING hnsw (vector halfvec_ip_ops)"
+                f" WITH (m = {m}, ef_construction = {ef_construction})"
+            ))
             await session.commit()
-        
-        print(f"✅ Indexed {indexed} tool embeddings")
-        return indexed
     
+    async def _embed_query(self, query: str) -> List[float]:
+        """Embed a query, serving repeated intents from an LRU cache.
+
+        Keys are whitespace-collapsed and lowercased so trivial phrasing
+        differences still hit.
+        """
+        key = " ".join(query.strip().lower().split())
+        cached = self._query_cache.get(key)
+        if cached is not None:
+            self._query_cache.move_to_end(key)
+            return cached
+        vector = await self._get_embedding(query)
+        if vector:
+            self._query_cache[key] = vector
+            if len(self._query_cache) > _QUERY_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
+        return vector
+
     async def search(self, query: str, k: int = 5) -> List[ToolCandidate]:
         """Semantic search for relevant tools."""
-        query_vector = await self._get_embedding(query)
-        
+        query_vector = await self._embed_query(query)
+
         if not query_vector:
             return []
         
         async with async_session() as session:
-            # pgvector cosine distance search
-            stmt = text("""
-                SELECT tool_name, command_name, description, risk_level,
-                       1 - (vector <=> :query_vector::vector) as similarity
-                FROM tool_embeddings
-                ORDER BY vector <=> :query_vector::vector
-                LIMIT :k
-            """)
-            
-            result = await session.execute(stmt, {
-                "query_vector": str(query_vector),
+            # Transaction-local ANN beam width for the HNSW index declared in
+            # database.py; set_config(..., true) = SET LOCAL with a bind param
+            await session.execute(
+                text("SELECT set_config('hnsw.ef_search', :ef, true)"),
+                {"ef": str(self._ef_search)}
+            )
+            result = await session.execute(_TOOL_SEARCH_STMT, {
+                "query_vector": query_vector,
                 "k": k
             })
             rows = result.fetchall()
-            
+
             candidates = []
-            seen_tools = set()
-            
-            for row in rows:
-                tool_name = row[0]
-                command_name = row[1]
-                description = row[2]
-                risk_level = row[3]
-                similarity = row[4]
-                
+
+            for tool_name, command_name, description, risk_level, similarity in rows:
                 # Get template from cache
                 template = None
                 if tool_name in self._tools_cache:
@@ -229,19 +484,16 @@ class ToolRAG:
                             if cmd.name == command_name:
                                 template = cmd.template
                                 break
-                
-                # Deduplicate by tool (keep highest similarity)
-                if tool_name not in seen_tools:
-                    seen_tools.add(tool_name)
-                    candidates.append(ToolCandidate(
-                        tool=tool_name,
-                        command=command_name,
-                        similarity=float(similarity),
-                        description=description,
-                        risk_level=RiskLevel(risk_level) if risk_level in [r.value for r in RiskLevel] else RiskLevel.LOW,
-                        template=template
-                    ))
-            
+
+                candidates.append(ToolCandidate(
+                    tool=tool_name,
+                    command=command_name,
+                    similarity=float(similarity),
+                    description=description,
+                    risk_level=_RISK_LOOKUP.get(risk_level, RiskLevel.LOW),
+                    template=template
+                ))
+
             return candidates
     
     async def select_tool(
@@ -255,8 +507,6 @@ class ToolRAG:
         if not candidates:
             return None
         
-        import httpx
-        
         # Build candidate list for prompt
         candidate_text = "\n".join([
             f"{i+1}. {c.tool}" + (f" ({c.command})" if c.command else "") + 
@@ -280,27 +530,26 @@ Respond in JSON format ONLY:
     "confidence": <0.0-1.0>
 }}"""
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                f"{self._ollama_base_url}/api/chat",
-                json={
-                    "model": model,
-                    "messages": [{"role": "user", "content": prompt}],
-                    "stream": False
-                }
-            )
-            response.raise_for_status()
-            data = response.json()
-            content = data.get("message", {}).get("content", "{}")
+        response = await self._get_client().post(
+            "/api/chat",
+            json={
+                "model": model,
+                "messages": [{"role": "user", "content": prompt}],
+                "stream": False
+            },
+            timeout=30.0
+        )
+        response.raise_for_status()
+        data = response.json()
+        content = data.get("message", {}).get("content", "{}")
         
-        # Parse JSON response
-        import re
+        # Parse JSON response (orjson: small LLM objects decode 2-5x
+        # faster than stdlib json)
         try:
-            json_match = re.search(r'\{.*\}', content, re.DOTALL)
-            if json_match:
-                selection_data = json.loads(json_match.group())
-            else:
-                selection_data = json.loads(content)
+            json_match = _JSON_OBJ_RE.search(content)
+            selection_data = orjson.loads(
+                json_match.group() if json_match else content
+            )
             
             # Find the selected candidate to get risk level
             selected_candidate = next(
@@ -4,269 +4,245 @@
 This script parses tools.json and installs all required tools.
 """
 
+import atexit
 import json
+import os
 import subprocess
 import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from graphlib import CycleError, TopologicalSorter
 from pathlib import Path
 from typing import Dict, List, Set
 
-# Tool name to package mapping - ONLY packages that exist in apt repositories
-# Many security tools are not in apt, they need to be installed via pip, git, or snap
-TOOL_PACKAGE_MAP = {
-    # System packages (apt) - verified to exist
-    "nmap_scan": "nmap",
-    "port_scan": "nmap",
-    "service_detection": "nmap",
-    "os_detection": "nmap",
-    "banner_grabbing": "nmap",
-    "metasploit_exploit": "metasploit-framework",
-    "dns_enum": "dnsutils",
-    "whois_lookup": "whois",
-    "ssl_cert_scan": "openssl",
-    "subdomain_discovery": "dnsutils",
-    "password_crack": "hashcat",
-    "brute_force_login": "hydra",
-    "credential_stuffing": "hydra",
-    "network_traffic_analysis": "wireshark",
-    "log_analyzer": "logwatch",
-    "ioc_checker": "yara",
-    "vulnerability_scanner": "gvm",  # OpenVAS/GVM
-    "reverse_shell": "netcat-traditional",  # Explicitly select netcat variant
-}
-
-# Python packages (pip) - ONLY packages that exist on PyPI
-# Many security tools are not on PyPI, they need to be installed via git or manual setup
-PYTHON_PACKAGES = {
-    "shodan_search": "shodan",
-    "virustotal_scan": "virustotal-api",
-    "web_search": "google-search-results",
-    "http_header_analysis": "requests",
-    "dns_enum": "dnspython",
-    "whois_lookup": "python-whois",
-    "ip_geolocation": "geoip2",
-    "reverse_ip_lookup": "dnspython",
-    "web_archive_search": "waybackpy",
-    "technology_detection": "python-Wappalyzer",
-    "waf_detection": "wafw00f",
-    "jwt_analysis": "pyjwt",
-    "oauth_test": "requests-oauthlib",
-    "template_injection_test": "tplmap",
-    "nosql_injection_test": "pymongo",
-    "xpath_injection_test": "lxml",
-    "xxe_blind_test": "lxml",
-    "websocket_test": "websocket-client",
-    "dns_rebinding": "dnspython",
-    "secret_scanning": "truffleHog",
-    "email_harvesting": "theHarvester",
-    "social_media_recon": "sherlock-project",
-    "certificate_transparency": "ctfr",
-    "breach_check": "h8mail",
-    "password_leak_check": "haveibeenpwned",
-    "sql_injection_test": "sqlmap",
-    "time_based_blind_sqli": "sqlmap",
-    "boolean_blind_sqli": "sqlmap",
-    "union_based_sqli": "sqlmap",
-    "error_based_sqli": "sqlmap",
-}
-
-# Packages that don't exist on PyPI (need git install or manual setup)
-# These are commented out to avoid installation errors
-PYTHON_PACKAGES_NOT_ON_PYPI = {
-    "cms_detection": "CMSeeK",  # Not on PyPI - needs git install
-    "api_endpoint_discovery": "arjun",  # Not on PyPI - needs git install
-    "graphql_introspection": "graphqlmap",  # Not on PyPI - needs git install
-    "subdomain_takeover": "subjack",  # Not on PyPI - needs git install
-    "github_recon": "gitrob",  # Not on PyPI - needs git install
-}
-
-# Git-based tools (need to clone and install manually)
-# These are tools that are typically installed from GitHub
-GIT_TOOLS = {
-    "directory_bruteforce": "https://github.com/OJ/gobuster.git",
-    "command_injection_test": "https://github.com/commixproject/commix.git",
-    "path_traversal_test": "https://github.com/wireghoul/dotdotpwn.git",
-    "deserialization_test": "https://github.com/frohoff/ysoserial.git",
-    "api_fuzzing": "https://github.com/ffuf/ffuf.git",
-    "privilege_escalation_check": "https://github.com/carlospolop/PEASS-ng.git",
-    "exploit_search": "https://github.com/offensive-security/exploitdb.git",
-    "reverse_ip_lookup": "https://github.com/darkoperator/dnsrecon.git",
-    "subdomain_discovery": "https://github.com/projectdiscovery/subfinder.git",
-    "xss_test": "https://github.com/epsylon/xsser.git",
-    "csrf_test": "https://github.com/0xInfection/XSRFProbe.git",
-    "ssrf_test": "https://github.com/swisskyrepo/SSRFmap.git",
-    "xxe_test": "https://github.com/enjoiz/XXEinjector.git",
-    "ldap_injection_test": "ldapsearch",  # Usually comes with ldap-utils
-    "file_upload_test": "upload-scanner",  # Generic - may need custom implementation
-    "open_redirect_test": "open-redirect-scanner",  # Generic - may need custom implementation
-    "idor_test": "idor-scanner",  # Generic - may need custom implementation
-    "rate_limit_test": "rate-limit-test",  # Generic - may need custom implementation
-    "clickjacking_test": "clickjacking-tester",  # Generic - may need custom implementation
-    "host_header_injection": "host-header-injection",  # Generic - may need custom implementation
-    "http_parameter_pollution": "hpp",  # Generic - may need custom implementation
-    "race_condition_test": "race-condition-tester",  # Generic - may need custom implementation
-    "business_logic_test": "business-logic-scanner",  # Generic - may need custom implementation
-    "file_inclusion_test": "lfi-scanner",  # Generic - may need custom implementation
-    "code_injection_test": "code-injection-scanner",  # Generic - may need custom implementation
-    "xpath_injection_test": "xpath-scanner",  # Generic - may need custom implementation
-    "xxe_blind_test": "xxe-scanner",  # Generic - may need custom implementation
-    "websocket_test": "websocket-scanner",  # Generic - may need custom implementation
-    "dns_rebinding": "dns-rebinding-scanner",  # Generic - may need custom implementation
-    "cache_poisoning_test": "cache-poisoning-scanner",  # Generic - may need custom implementation
-    "http_smuggling_test": "http-smuggling-scanner",  # Generic - may need custom implementation
-    "pipeline_test": "http-pipeline-scanner",  # Generic - may need custom implementation
-    "desync_attack": "http-desync-scanner",  # Generic - may need custom implementation
-    "stored_xss": "xsser",
-    "reflected_xss": "xsser",
-    "dom_xss": "xsser",
-    "mutation_xss": "xsser",
-    "prototype_pollution": "prototype-pollution-scanner",  # Generic - may need custom implementation
-    "dom_clobbering": "dom-clobbering-scanner",  # Generic - may need custom implementation
-    "postmessage_vuln": "postmessage-scanner",  # Generic - may need custom implementation
-    "webhook_test": "webhook-scanner",  # Generic - may need custom implementation
-    "api_key_extraction": "api-key-scanner",  # Generic - may need custom implementation
-    "session_hijack": "burpsuite",  # Commercial tool - needs manual install
-    "payload_generator": "msfvenom",  # Part of metasploit-framework
-    "threat_intel_lookup": "misp",  # Needs manual setup
-    "malware_analysis": "cuckoo",  # Needs manual setup
-    "cve_lookup": "cve-search",  # Needs manual setup
-    "robots_txt_check": "robots-txt-checker",  # Generic - may need custom implementation
-    "sitemap_analysis": "sitemap-parser",  # Generic - may need custom implementation
-    "wappalyzer": "wappalyzer",  # Usually npm package
-    "waybackpy": "waybackpy",  # Already in PYTHON_PACKAGES
-}
-
-# Tools that don't need installation (built-in or API-based)
-NO_INSTALL_NEEDED = {
-    "web_search",  # Uses SerpAPI
-    "shodan_search",  # Uses Shodan API (needs API key)
-    "virustotal_scan",  # Uses VirusTotal API (needs API key)
-    "dns_enum",  # Uses built-in DNS libraries
-    "whois_lookup",  # Uses built-in whois
-    "ssl_cert_scan",  # Uses built-in OpenSSL
-    "http_header_analysis",  # Uses requests library
-    "subdomain_discovery",  # Uses DNS libraries
-    "ip_geolocation",  # Uses API services
-    "reverse_ip_lookup",  # Uses DNS libraries
-    "breach_check",  # Uses API services
-    "password_leak_check",  # Uses API services
-    "web_archive_search",  # Uses API services
-    "robots_txt_check",  # Uses requests
-    "sitemap_analysis",  # Uses requests
-    "technology_detection",  # Uses libraries
-    "waf_detection",  # Uses libraries
-    "cms_detection",  # Uses libraries
-    "api_endpoint_discovery",  # Uses requests
-    "graphql_introspection",  # Uses requests
-    "jwt_analysis",  # Uses libraries
-    "oauth_test",  # Uses requests
-    "open_redirect_test",  # Uses requests
-    "idor_test",  # Uses requests
-    "rate_limit_test",  # Uses requests
-    "clickjacking_test",  # Uses requests
-    "host_header_injection",  # Uses requests
-    "http_parameter_pollution",  # Uses requests
-    "template_injection_test",  # Uses libraries
-    "race_condition_test",  # Uses requests
-    "business_logic_test",  # Uses requests
-    "file_inclusion_test",  # Uses requests
-    "code_injection_test",  # Uses requests
-    "nosql_injection_test",  # Uses libraries
-    "xpath_injection_test",  # Uses libraries
-    "xxe_blind_test",  # Uses libraries
-    "websocket_test",  # Uses libraries
-    "dns_rebinding",  # Uses DNS libraries
-    "subdomain_takeover",  # Uses libraries
-    "cache_poisoning_test",  # Uses requests
-    "http_smuggling_test",  # Uses requests
-    "pipeline_test",  # Uses requests
-    "desync_attack",  # Uses requests
-    "stored_xss",  # Uses requests
-    "reflected_xss",  # Uses requests
-    "dom_xss",  # Uses requests
-    "mutation_xss",  # Uses requests
-    "prototype_pollution",  # Uses requests
-    "dom_clobbering",  # Uses requests
-    "postmessage_vuln",  # Uses requests
-    "webhook_test",  # Uses requests
-    "api_key_extraction",  # Uses requests
-    "secret_scanning",  # Uses libraries
-    "credential_stuffing",  # Uses libraries
-}
+from package_table import load_table
+
+# Concurrent existence probes: the checks are subprocess/network bound, so
+# wall time drops from the sum of all probes to roughly the slowest one per
+# batch of this size
+_PROBE_WORKERS = 16
+
+# All tool -> package truth lives in packages.tsv (shared with
+# install_tools_uv.py); columns are parallel lists, one row per tool.
+# The git and no_install columns are informational here, as the dicts
+# they replaced were.
+_TABLE = load_table()
 
 
 def load_tools() -> List[Dict]:
     """Load tools from tools.json."""
     tools_file = Path(__file__).parent.parent / "tools" / "metadata" / "tools.json"
-    with open(tools_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    try:
+        # C tokenizer over raw bytes; the backend venv ships orjson, but
+        # this script may run outside it, hence the stdlib fallback
+        import orjson
+        data = orjson.loads(tools_file.read_bytes())
+    except ImportError:
+        with open(tools_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
     return data.get("tools", [])
 
 
 def get_system_packages(tools: List[Dict]) -> Set[str]:
     """Extract system packages needed."""
     packages = set()
+    # Bound method + local column: no attribute loads inside the loop
+    index_get = _TABLE.index.get
+    apt = _TABLE.apt
     for tool in tools:
-        tool_name = tool.get("name")
-        if tool_name in TOOL_PACKAGE_MAP:
-            package = TOOL_PACKAGE_MAP[tool_name]
-            if package:
-                packages.add(package)
+        i = index_get(tool.get("name"))
+        if i is not None and apt[i]:
+            packages.add(apt[i])
     return packages
 
 
 def get_python_packages(tools: List[Dict]) -> Set[str]:
     """Extract Python packages needed."""
     packages = set()
+    index_get = _TABLE.index.get
+    pypi = _TABLE.pypi
     for tool in tools:
-        tool_name = tool.get("name")
-        if tool_name in PYTHON_PACKAGES:
-            package = PYTHON_PACKAGES[tool_name]
-            if package:
-                packages.add(package)
+        i = index_get(tool.get("name"))
+        if i is not None and pypi[i]:
+            packages.add(pypi[i])
     return packages
 
 
+# Probe answers change on the order of days; cache them on disk so warm
+# runs skip the subprocess/network phase entirely
+_CACHE_PATH = Path.home() / ".cache" / "firestarter" / "pkg_probe.json"
+_CACHE_TTL = 86400  # seconds
+
+_probe_cache = None
+_probe_cache_dirty = False
+_probe_cache_lock = threading.Lock()  # probes run from pool threads
+
+
+def _apt_fingerprint() -> float:
+    """mtime of the apt package index; changes when apt-get update runs."""
+    try:
+        return os.stat("/var/lib/apt/lists").st_mtime
+    except OSError:
+        return 0.0
+
+
+def _load_probe_cache() -> Dict:
+    global _probe_cache
+    with _probe_cache_lock:
+        if _probe_cache is not None:
+            return _probe_cache
+        try:
+            _probe_cache = json.loads(_CACHE_PATH.read_text())
+        except (OSError, ValueError):
+            _probe_cache = {}
+        # A refreshed apt index invalidates apt answers regardless of TTL
+        if _probe_cache.get("_apt_fingerprint") != _apt_fingerprint():
+            _probe_cache = {
+                k: v for k, v in _probe_cache.items()
+                if not k.startswith("apt:")
+            }
+        _probe_cache["_apt_fingerprint"] = _apt_fingerprint()
+        atexit.register(_save_probe_cache)
+    return _probe_cache
+
+
+def _save_probe_cache():
+    if not _probe_cache_dirty:
+        return
+    try:
+        _CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp = _CACHE_PATH.with_suffix(".tmp")
+        tmp.write_text(json.dumps(_probe_cache))
+        os.replace(tmp, _CACHE_PATH)  # atomic swap, no torn cache
+    except OSError:
+        pass
+
+
+def _probe_cached(kind: str, package: str, probe) -> bool:
+    """Answer from the disk cache when fresh, else probe and record."""
+    global _probe_cache_dirty
+    cache = _load_probe_cache()
+    entry = cache.get(f"{kind}:{package}")
+    if entry and time.time() - entry[1] < _CACHE_TTL:
+        return entry[0]
+    result = probe(package)
+    cache[f"{kind}:{package}"] = [result, time.time()]
+    _probe_cache_dirty = True
+    return result
+
+
 def check_package_exists(package: str) -> bool:
-    """Check if a package exists in apt repositories."""
+    """Check if a package exists in apt repositories (disk-cached)."""
+    return _probe_cached("apt", package, _probe_apt_package)
+
+
+@lru_cache(maxsize=1)
+def _apt_index() -> frozenset:
+    """Every known apt package name, loaded in one subprocess.
+
+    apt-cache mmaps the whole package index per invocation; loading the
+    name list once and intersecting in Python amortizes that fixed cost
+    across all probes. Empty set when apt is unavailable.
+    """
     try:
         result = subprocess.run(
-            ["apt-cache", "search", "--names-only", f"^{package}$"],
+            ["apt-cache", "pkgnames"],
             capture_output=True,
             text=True,
-            timeout=5
+            timeout=30
         )
-        return len(result.stdout.strip()) > 0
-    except (subprocess.TimeoutExpired, subprocess.CalledProcessError, FileNotFoundError):
-        return False
+        if result.returncode == 0:
+            return frozenset(result.stdout.split())
+    except (subprocess.TimeoutExpired, OSError):
+        pass
+    return frozenset()
+
+
+def _probe_apt_package(package: str) -> bool:
+    return package in _apt_index()
 
 
-def install_system_packages(packages: Set[str], dry_run: bool = False, skip_missing: bool = True):
+def toposort_system_packages(packages: List[str]) -> List[str]:
+    """Order apt packages dependencies-first.
+
+    apt resolves dependencies itself, but a pre-ordered list spares its
+    resolver backtracking and partial-configure cycles. Edges come from
+    one bulk apt-cache depends call, restricted to packages within the
+    install set; on a dependency cycle (or no apt) the input order is
+    returned and apt deals with it.
+    """
+    if len(packages) < 2:
+        return packages
+    try:
+        result = subprocess.run(
+            ["apt-cache", "depends", *packages],
+            capture_output=True,
+            text=True,
+            timeout=30
+        )
+    except (subprocess.TimeoutExpired, OSError):
+        return packages
+    if result.returncode != 0:
+        return packages
+
+    deps: Dict[str, Set[str]] = {p: set() for p in packages}
+    current = None
+    for line in result.stdout.splitlines():
+        if not line.startswith(" "):
+            current = line.strip().rstrip(":")
+        elif "Depends:" in line:
+            dep = line.split(":", 1)[1].strip().lstrip("<").rstrip(">")
+            if current in deps and dep in deps and dep != current:
+                deps[current].add(dep)
+    try:
+        return list(TopologicalSorter(deps).static_order())
+    except CycleError:
+        return packages
+
+
+def install_system_packages(packages: Set[str], dry_run: bool = False, skip_missing: bool = True,
+                            terminal: bool = False):
     """Install system packages using apt.
-    
+
     Args:
         packages: Set of package names
         dry_run: If True, only show what would be installed
         skip_missing: If True, skip packages that don't exist in apt
+        terminal: If True, this is the last work of the process and the
+            final install exec-replaces it instead of fork+wait
     """
     if not packages:
         return
     
     print(f"\n📦 Checking {len(packages)} system package(s)...")
-    
-    # Filter packages that exist in apt
+
+    # Probe in parallel, then print in order from the main thread
+    ordered = sorted(packages)
+    with ThreadPoolExecutor(max_workers=_PROBE_WORKERS) as pool:
+        results = list(pool.map(check_package_exists, ordered))
+
     existing_packages = []
     missing_packages = []
-    
-    for package in sorted(packages):
-        if check_package_exists(package):
+    status = []
+
+    for package, exists in zip(ordered, results):
+        if exists:
             existing_packages.append(package)
-            print(f"  ✅ {package} (available)")
+            status.append(f"  ✅ {package} (available)")
         else:
             missing_packages.append(package)
             if skip_missing:
-                print(f"  ⚠️  {package} (not found in apt - skipping)")
+                status.append(f"  ⚠️  {package} (not found in apt - skipping)")
             else:
-                print(f"  ❌ {package} (not found in apt)")
+                status.append(f"  ❌ {package} (not found in apt)")
+    # One buffered write for the whole phase instead of a line-flushed
+    # print per package
+    sys.stdout.write("\n".join(status) + "\n")
     
     if missing_packages and not skip_missing:
         print(f"\n❌ {len(missing_packages)} package(s) not found in apt repositories")
@@ -276,7 +252,9 @@ def install_system_packages(packages: Set[str], dry_run: bool = False, skip_miss
     if not existing_packages:
         print("⚠️  No packages available in apt repositories")
         return
-    
+
+    existing_packages = toposort_system_packages(existing_packages)
+
     print(f"\n📦 Installing {len(existing_packages)} available package(s)...")
     for package in existing_packages:
         print(f"  - {package}")
@@ -291,6 +269,8 @@ def install_system_packages(packages: Set[str], dry_run: bool = False, skip_miss
         subprocess.run(["sudo", "apt-get", "update"], check=True)
         # Install packages
         print(f"📥 Installing packages...")
+        if terminal:
+            _exec_final(["sudo", "apt-get", "install", "-y"] + existing_packages)
         subprocess.run(["sudo", "apt-get", "install", "-y"] + existing_packages, check=True)
         print(f"✅ Successfully installed {len(existing_packages)} package(s)")
         if missing_packages:
@@ -303,60 +283,78 @@ def install_system_packages(packages: Set[str], dry_run: bool = False, skip_miss
 
 
 def check_pypi_package_exists(package: str) -> bool:
-    """Check if a package exists on PyPI by trying to get its metadata."""
+    """Check if a package exists on PyPI (disk-cached)."""
+    return _probe_cached("pypi", package, _probe_pypi_package)
+
+
+def _probe_pypi_package(package: str) -> bool:
+    """Probe PyPI's JSON metadata endpoint for a package name.
+
+    One HTTP HEAD replaces the old pip show / pip install --dry-run
+    subprocess pair, which paid interpreter startup plus a full resolver
+    run per package.
+    """
+    req = urllib.request.Request(
+        f"https://pypi.org/pypi/{package}/json", method="HEAD"
+    )
     try:
-        # Try using pip show (fastest, works if package is installed)
-        result = subprocess.run(
-            [sys.executable, "-m", "pip", "show", package],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        if result.returncode == 0:
+        with urllib.request.urlopen(req, timeout=3):
             return True
-        
-        # Try using pip install --dry-run (simulates install without actually installing)
-        result = subprocess.run(
-            [sys.executable, "-m", "pip", "install", "--dry-run", package],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
-        # If dry-run succeeds, package exists
-        return result.returncode == 0
-    except (subprocess.TimeoutExpired, subprocess.CalledProcessError, FileNotFoundError):
-        # If check fails, assume package exists and let pip handle the error
-        # This is safer than blocking valid packages
+    except urllib.error.HTTPError as e:
+        return e.code != 404
+    except (urllib.error.URLError, OSError):
+        # Offline or PyPI unreachable: assume the package exists and let
+        # pip handle the error — safer than blocking valid packages
         return True
 
 
-def install_python_packages(packages: Set[str], dry_run: bool = False, skip_missing: bool = True):
+def _exec_final(cmd: List[str]):
+    """Replace this process with the final install command.
+
+    Saves a fork+wait and releases the interpreter's memory while the
+    installer runs; the probe cache is written first since atexit hooks
+    don't survive exec. The command's own exit status becomes ours.
+    """
+    _save_probe_cache()
+    sys.stdout.flush()
+    os.execvp(cmd[0], cmd)
+
+
+def install_python_packages(packages: Set[str], dry_run: bool = False, skip_missing: bool = True,
+                            terminal: bool = False):
     """Install Python packages using pip.
-    
+
     Args:
         packages: Set of package names
         dry_run: If True, only show what would be installed
         skip_missing: If True, skip packages that don't exist on PyPI
+        terminal: If True, the final pip install exec-replaces the process
     """
     if not packages:
         return
     
     print(f"\n🐍 Checking {len(packages)} Python package(s)...")
-    
-    # Filter packages that exist on PyPI
+
+    # Probe in parallel, then print in order from the main thread
+    ordered = sorted(packages)
+    with ThreadPoolExecutor(max_workers=_PROBE_WORKERS) as pool:
+        results = list(pool.map(check_pypi_package_exists, ordered))
+
     existing_packages = []
     missing_packages = []
-    
-    for package in sorted(packages):
-        if check_pypi_package_exists(package):
+    status = []
+
+    for package, exists in zip(ordered, results):
+        if exists:
             existing_packages.append(package)
-            print(f"  ✅ {package} (available on PyPI)")
+            status.append(f"  ✅ {package} (available on PyPI)")
         else:
             missing_packages.append(package)
             if skip_missing:
-                print(f"  ⚠️  {package} (not found on PyPI - skipping)")
+                status.append(f"  ⚠️  {package} (not found on PyPI - skipping)")
             else:
-                print(f"  ❌ {package} (not found on PyPI)")
+                status.append(f"  ❌ {package} (not found on PyPI)")
+    sys.stdout.write("\n".join(status) + "\n")
     
     if missing_packages and not skip_missing:
         print(f"\n❌ {len(missing_packages)} package(s) not found on PyPI")
@@ -377,7 +375,19 @@ def install_python_packages(packages: Set[str], dry_run: bool = False, skip_miss
     
     try:
         print(f"📥 Installing packages...")
-        subprocess.run([sys.executable, "-m", "pip", "install"] + existing_packages, check=True)
+        # A requirements file instead of argv stays clear of ARGMAX on
+        # long lists and is the input shape pip's resolver and parallel
+        # downloads are tuned for
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", prefix="firestarter-reqs-",
+                                         delete=False) as reqs:
+            reqs.write("\n".join(existing_packages) + "\n")
+        pip_cmd = [sys.executable, "-m", "pip", "install", "-r", reqs.name]
+        if terminal:
+            _exec_final(pip_cmd)  # temp file is left to /tmp cleanup
+        try:
+            subprocess.run(pip_cmd, check=True)
+        finally:
+            os.unlink(reqs.name)
         print(f"✅ Successfully installed {len(existing_packages)} package(s)")
         if missing_packages:
             print(f"⚠️  Skipped {len(missing_packages)} package(s) not found on PyPI (may need git install)")
@@ -414,14 +424,31 @@ def main():
     print(f"\n📊 Summary:")
     print(f"  - System packages: {len(system_packages)}")
     print(f"  - Python packages: {len(python_packages)}")
-    
-    # Install packages
+
+    # When both phases run, warm the apt and PyPI probe caches in one
+    # shared pool first: the two probe sets hit independent endpoints, so
+    # check latency is max(apt, pypi) instead of apt + pypi. The install
+    # functions below then answer every check from the warm cache; the
+    # sudo apt-get steps stay sequential, so no competing prompts.
+    if not args.python_only and not args.system_only:
+        with ThreadPoolExecutor(max_workers=_PROBE_WORKERS) as pool:
+            futures = [pool.submit(check_package_exists, p)
+                       for p in system_packages]
+            futures += [pool.submit(check_pypi_package_exists, p)
+                        for p in python_packages]
+            for future in futures:
+                future.result()
+
+    # Install packages; whichever phase runs last may exec-replace the
+    # process with its install command, so its output ends the run
     if not args.python_only:
-        install_system_packages(system_packages, dry_run=args.dry_run, skip_missing=args.skip_missing)
-    
+        install_system_packages(system_packages, dry_run=args.dry_run, skip_missing=args.skip_missing,
+                                terminal=args.system_only and not args.dry_run)
+
     if not args.system_only:
-        install_python_packages(python_packages, dry_run=args.dry_run, skip_missing=args.skip_missing)
-    
+        install_python_packages(python_packages, dry_run=args.dry_run, skip_missing=args.skip_missing,
+                                terminal=not args.dry_run)
+
     print("\n✅ Installation complete!")
 
 
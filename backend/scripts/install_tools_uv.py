@@ -12,47 +12,72 @@ Usage:
   python install_tools_uv.py --check      # Check what's installed
 """
 
+import os
 import subprocess
 import shutil
 import sys
 import argparse
-from typing import Dict, List
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
 
+from package_table import load_table
+
+# All tool -> package truth lives in packages.tsv (shared with
+# install_tools.py); the per-manager dicts below are views over its
+# columns, built in one zip pass each
+_TABLE = load_table()
 
 # Python tools (install via uv pip)
 PYTHON_TOOLS: Dict[str, str] = {
-    "shodan": "shodan",
-    "dnspython": "dnspython",
-    "python-whois": "python-whois",
-    "requests": "requests",
-    "httpx": "httpx",
-    "beautifulsoup4": "beautifulsoup4",
-    "pyyaml": "pyyaml",
-    "sqlmap": "sqlmap",
-    "theHarvester": "theharvester",
+    name: pkg for name, pkg in zip(_TABLE.names, _TABLE.pypi) if pkg
 }
 
 # Go tools (install via go install)
 GO_TOOLS: Dict[str, str] = {
-    "subfinder": "github.com/projectdiscovery/subfinder/v2/cmd/subfinder@latest",
-    "amass": "github.com/owasp-amass/amass/v4/...@master",
-    "nuclei": "github.com/projectdiscovery/nuclei/v3/cmd/nuclei@latest",
-    "httpx-go": "github.com/projectdiscovery/httpx/cmd/httpx@latest",
-    "katana": "github.com/projectdiscovery/katana/cmd/katana@latest",
-    "gobuster": "github.com/OJ/gobuster/v3@latest",
-    "ffuf": "github.com/ffuf/ffuf/v2@latest",
+    name: pkg for name, pkg in zip(_TABLE.names, _TABLE.go) if pkg
 }
 
 # System tools (apt/brew)
 SYSTEM_TOOLS: Dict[str, str] = {
-    "nmap": "nmap",
-    "masscan": "masscan",
-    "nikto": "nikto",
-    "whois": "whois",
-    "dig": "dnsutils",  # dig is in dnsutils package
+    name: pkg for name, pkg in zip(_TABLE.names, _TABLE.apt) if pkg
 }
 
 
+def run_quiet(cmd: List[str], timeout: int) -> Tuple[int, str, bool]:
+    """Run a command, discarding stdout and keeping only a stderr tail.
+
+    capture_output buffered every byte of build output (megabytes for
+    the big Go compiles) just to print a short failure hint. Streaming
+    stderr through a bounded deque keeps memory flat and can't stall on
+    a full pipe. Returns (returncode, last stderr lines, timed_out).
+    """
+    proc = subprocess.Popen(
+        cmd,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True
+    )
+    tail: deque = deque(maxlen=5)
+    timed_out = threading.Event()
+
+    def _kill():
+        timed_out.set()
+        proc.kill()
+
+    timer = threading.Timer(timeout, _kill)
+    timer.start()
+    try:
+        for line in proc.stderr:
+            tail.append(line)
+        returncode = proc.wait()
+    finally:
+        timer.cancel()
+    return returncode, "".join(tail).strip(), timed_out.is_set()
+
+
 def check_uv_installed() -> bool:
     """Check if uv is installed."""
     return shutil.which("uv") is not None
@@ -73,6 +98,30 @@ def install_uv():
     print("✅ uv installed")
 
 
+def _installed_python_packages() -> set:
+    """Package names already in the environment, from one uv pip list.
+
+    Saves uv a resolver + metadata fetch per already-satisfied package
+    on warm runs; an empty set (uv missing/failed) just means nothing
+    gets skipped.
+    """
+    try:
+        result = subprocess.run(
+            ["uv", "pip", "list", "--format=freeze"],
+            capture_output=True,
+            text=True,
+            timeout=30
+        )
+        if result.returncode == 0:
+            return {
+                line.split("==")[0].strip().lower()
+                for line in result.stdout.splitlines() if line
+            }
+    except (subprocess.TimeoutExpired, OSError):
+        pass
+    return set()
+
+
 def install_python_tools(tools: Dict[str, str] = None):
     """Install Python tools using uv."""
     tools = tools or PYTHON_TOOLS
@@ -81,23 +130,62 @@ def install_python_tools(tools: Dict[str, str] = None):
         print("⚠️ uv not found. Installing uv first...")
         install_uv()
     
-    print(f"\n🐍 Installing {len(tools)} Python tools with uv...")
-    
-    for name, package in tools.items():
-        print(f"  📦 {name}...", end=" ", flush=True)
+    # One invocation for the whole set: uv's parallel resolver and shared
+    # wheel cache only amortize when it sees every package at once —
+    # per-package calls serialize resolution and TLS handshakes
+    packages = sorted(set(tools.values()))
+    print(f"\n🐍 Checking {len(packages)} Python tools...")
+
+    installed = _installed_python_packages()
+    pending = [p for p in packages if p.lower() not in installed]
+    for package in packages:
+        if package.lower() in installed:
+            print(f"  ✅ {package} (already installed)")
+
+    if not pending:
+        print("✅ All Python tools already installed")
+        return
+    packages = pending
+
+    print(f"\n🐍 Installing {len(packages)} Python tools with uv...")
+    for package in packages:
+        print(f"  📦 {package}")
+
+    # A requirements file instead of argv stays clear of ARGMAX on long
+    # lists and is the input shape uv's resolver is tuned for
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", prefix="firestarter-reqs-",
+                                     delete=False) as reqs:
+        reqs.write("\n".join(packages) + "\n")
+    try:
+        returncode, _, timed_out = run_quiet(
+            ["uv", "pip", "install", "-r", reqs.name], timeout=600
+        )
+        if returncode == 0:
+            print("✅ All Python tools installed")
+            return
+        if timed_out:
+            print("⏰ Batch install timed out, retrying per package...")
+        else:
+            print(f"⚠️ Batch install failed, retrying per package to isolate...")
+    except Exception as e:
+        print(f"❌ {e}")
+        return
+    finally:
+        os.unlink(reqs.name)
+
+    # Fallback: one resolvable bad name shouldn't sink the rest
+    for package in packages:
+        print(f"  📦 {package}...", end=" ", flush=True)
         try:
-            result = subprocess.run(
-                ["uv", "pip", "install", package],
-                capture_output=True,
-                text=True,
-                timeout=120
+            returncode, stderr_tail, timed_out = run_quiet(
+                ["uv", "pip", "install", package], timeout=120
             )
-            if result.returncode == 0:
+            if timed_out:
+                print("⏰ timeout")
+            elif returncode == 0:
                 print("✅")
             else:
-                print(f"❌ {result.stderr[:50]}")
-        except subprocess.TimeoutExpired:
-            print("⏰ timeout")
+                print(f"❌ {stderr_tail[:50]}")
         except Exception as e:
             print(f"❌ {e}")
 
@@ -112,41 +200,69 @@ def install_go_tools(tools: Dict[str, str] = None):
         return
     
     print(f"\n🔧 Installing {len(tools)} Go tools...")
-    
-    for name, package in tools.items():
-        print(f"  📦 {name}...", end=" ", flush=True)
+
+    # go install fetches + compiles per package with no shared mutable
+    # state (the module cache is concurrency-safe), so the builds run in
+    # parallel across cores; results print in order as they complete
+    def _install_one(item: Tuple[str, str]) -> Tuple[str, str]:
+        name, package = item
         try:
-            result = subprocess.run(
-                ["go", "install", "-v", package],
-                capture_output=True,
-                text=True,
-                timeout=300
+            returncode, _, timed_out = run_quiet(
+                ["go", "install", "-v", package], timeout=300
             )
-            if result.returncode == 0:
-                print("✅")
-            else:
-                print(f"❌")
-        except subprocess.TimeoutExpired:
-            print("⏰ timeout")
+            if timed_out:
+                return name, "⏰ timeout"
+            return name, "✅" if returncode == 0 else "❌"
         except Exception as e:
-            print(f"❌ {e}")
+            return name, f"❌ {e}"
+
+    workers = min(os.cpu_count() or 1, len(tools))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for name, status in pool.map(_install_one, tools.items()):
+            print(f"  📦 {name}... {status}")
+
+
+def _path_execs() -> set:
+    """Executable basenames from one scandir pass over PATH.
+
+    shutil.which walks every PATH directory per call; scanning each
+    directory once collapses O(tools x dirs) stat syscalls into O(dirs)
+    directory reads, then lookups are set probes.
+    """
+    execs = set()
+    for d in os.environ.get("PATH", os.defpath).split(os.pathsep):
+        try:
+            with os.scandir(d) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_file() and os.access(entry.path, os.X_OK):
+                            execs.add(entry.name)
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return execs
 
 
 def check_installed():
     """Check which tools are installed."""
     print("\n🔍 Checking installed tools...\n")
-    
+
     all_tools = list(PYTHON_TOOLS.keys()) + list(GO_TOOLS.keys()) + list(SYSTEM_TOOLS.keys())
     installed = []
     missing = []
-    
+
+    execs = _path_execs()
+    status = []
     for tool in sorted(set(all_tools)):
-        if shutil.which(tool):
+        if tool in execs:
             installed.append(tool)
-            print(f"  ✅ {tool}")
+            status.append(f"  ✅ {tool}")
         else:
             missing.append(tool)
-            print(f"  ❌ {tool}")
+            status.append(f"  ❌ {tool}")
+    # One buffered write instead of a line-flushed print per tool
+    sys.stdout.write("\n".join(status) + "\n")
     
     print(f"\n📊 Installed: {len(installed)}/{len(all_tools)}")
     if missing:
@@ -0,0 +1,59 @@
+"""Shared package table for the installer scripts.
+
+Single source of truth for tool -> package mappings, replacing the
+divergent dict literals that install_tools.py and install_tools_uv.py
+each redeclared. The data lives in
+backend/app/tools/metadata/packages.tsv (columns: name, apt, pypi, go,
+git, no_install) and is parsed once into parallel column lists — a
+struct-of-arrays layout: resolving a name is one dict probe into the
+row index, then direct column indexing, and "every X package" queries
+are a single linear zip over two columns.
+"""
+
+import csv
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, NamedTuple
+
+PACKAGES_TSV = (
+    Path(__file__).parent.parent / "app" / "tools" / "metadata" / "packages.tsv"
+)
+
+
+class PackageTable(NamedTuple):
+    """Parallel columns over all known tools; empty string = not mapped."""
+    names: List[str]
+    apt: List[str]
+    pypi: List[str]
+    go: List[str]
+    git: List[str]
+    no_install: List[bool]
+    index: Dict[str, int]  # name -> row position
+
+
+@lru_cache(maxsize=1)
+def load_table() -> PackageTable:
+    """Parse packages.tsv once into column lists."""
+    names: List[str] = []
+    apt: List[str] = []
+    pypi: List[str] = []
+    go: List[str] = []
+    git: List[str] = []
+    no_install: List[bool] = []
+
+    with open(PACKAGES_TSV, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f, delimiter="\t")
+        next(reader)  # header
+        for row in reader:
+            name_v, apt_v, pypi_v, go_v, git_v, noins_v = (row + [""] * 6)[:6]
+            names.append(name_v)
+            apt.append(apt_v)
+            pypi.append(pypi_v)
+            go.append(go_v)
+            git.append(git_v)
+            no_install.append(noins_v == "1")
+
+    return PackageTable(
+        names, apt, pypi, go, git, no_install,
+        {name: i for i, name in enumerate(names)}
+    )
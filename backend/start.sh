@@ -11,8 +11,18 @@ if [ -d "$VENV_PATH" ]; then
     source "$VENV_PATH/bin/activate"
     
     echo "🔥 Khởi động Firestarter AI Backend (Port 8000)..."
-    # Chạy trực tiếp uvicorn từ python module
-    python -m uvicorn app.main:app --host 0.0.0.0 --port 8000 --reload
+    # FIRESTARTER_DEBUG=1: 1 worker + auto-reload (dev).
+    # Mặc định: 1 worker + uvloop/httptools (đã có sẵn trong
+    # uvicorn[standard]); --reload tắt cả hai. Session/PTY state nằm
+    # trong bộ nhớ của worker, nên UVICORN_WORKERS>1 chỉ dùng được khi
+    # deploy stateless (session đã chuyển ra Redis).
+    if [ "$FIRESTARTER_DEBUG" = "1" ]; then
+        python -m uvicorn app.main:app --host 0.0.0.0 --port 8000 --reload
+    else
+        WORKERS="${UVICORN_WORKERS:-1}"
+        python -m uvicorn app.main:app --host 0.0.0.0 --port 8000 \
+            --workers "$WORKERS" --loop uvloop --http httptools
+    fi
 else
     echo "❌ Không tìm thấy venv tại $VENV_PATH"
     echo "Vui lòng tạo venv bằng lệnh: python3 -m venv venv"